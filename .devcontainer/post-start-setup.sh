@@ -4,7 +4,8 @@
 #    APIM SAMPLES INSTANT VERIFICATION
 # ------------------------------
 
-start=$(date +%s.%N)
+# EPOCHREALTIME is a bash builtin (microsecond resolution), so timing needs no extra processes
+start=${EPOCHREALTIME/[.,]/}
 
 # Make terminal output more prominent
 clear
@@ -51,8 +52,9 @@ else
 fi
 
 # Calculate total duration
-end=$(date +%s.%N)
-duration=$(python3 -c "print(f'{float('$end') - float('$start'):.1f}')" 2>/dev/null || echo "0.1")
+end=${EPOCHREALTIME/[.,]/}
+elapsed_ds=$(( (end - start + 50000) / 100000 ))
+duration="$(( elapsed_ds / 10 )).$(( elapsed_ds % 10 ))"
 
 echo ""
 echo "============================================================================"
@@ -5,11 +5,12 @@ This module provides a reusable way to create API Management with Azure Containe
 import sys
 import argparse
 from apimtypes import APIM_SKU, API, GET_APIOperation, BACKEND_XML_POLICY_PATH
-from infrastructures import ApimAcaInfrastructure
-import utils
 
 
 def create_infrastructure(location: str, index: int, apim_sku: APIM_SKU) -> None:
+    import utils
+    from infrastructures import ApimAcaInfrastructure
+
     try:
         # Check if infrastructure already exists to determine messaging
         infrastructure_exists = utils.does_resource_group_exist(utils.get_infra_rg_name(utils.INFRASTRUCTURE.APIM_ACA, index))
@@ -34,26 +35,17 @@ def _create_aca_specific_apis() -> list[API]:
     Returns:
         list[API]: List of ACA-specific APIs.
     """
+
+    import utils
     
     # Define the APIs with Container Apps backends
-    pol_backend          = utils.read_policy_xml(BACKEND_XML_POLICY_PATH)
-    pol_aca_backend_1    = pol_backend.format(backend_id = 'aca-backend-1')
-    pol_aca_backend_2    = pol_backend.format(backend_id = 'aca-backend-2')
-    pol_aca_backend_pool = pol_backend.format(backend_id = 'aca-backend-pool')
-
-    # API 1: Hello World (ACA Backend 1)
-    api_hwaca_1_get      = GET_APIOperation('This is a GET for Hello World on ACA Backend 1')
-    api_hwaca_1          = API('hello-world-aca-1', 'Hello World (ACA 1)', '/aca-1', 'This is the ACA API for Backend 1', pol_aca_backend_1, [api_hwaca_1_get])
+    pol_backend = utils.read_policy_xml(BACKEND_XML_POLICY_PATH)
 
-    # API 2: Hello World (ACA Backend 2)
-    api_hwaca_2_get      = GET_APIOperation('This is a GET for Hello World on ACA Backend 2')
-    api_hwaca_2          = API('hello-world-aca-2', 'Hello World (ACA 2)', '/aca-2', 'This is the ACA API for Backend 2', pol_aca_backend_2, [api_hwaca_2_get])
-
-    # API 3: Hello World (ACA Backend Pool)
-    api_hwaca_pool_get   = GET_APIOperation('This is a GET for Hello World on ACA Backend Pool')
-    api_hwaca_pool       = API('hello-world-aca-pool', 'Hello World (ACA Pool)', '/aca-pool', 'This is the ACA API for Backend Pool', pol_aca_backend_pool, [api_hwaca_pool_get])
-    
-    return [api_hwaca_1, api_hwaca_2, api_hwaca_pool]
+    return [
+        API(f'hello-world-aca-{suffix}', f'Hello World (ACA {label})', f'/aca-{suffix}', f'This is the ACA API for Backend {label}',
+            pol_backend.replace('{backend_id}', backend_id), [GET_APIOperation(f'This is a GET for Hello World on ACA Backend {label}')])
+        for suffix, label, backend_id in [('1', '1', 'aca-backend-1'), ('2', '2', 'aca-backend-2'), ('pool', 'Pool', 'aca-backend-pool')]
+    ]
 
 def main():
     """
@@ -5,11 +5,12 @@ This module provides a reusable way to create Simple APIM infrastructure that ca
 import sys
 import argparse
 from apimtypes import APIM_SKU
-from infrastructures import SimpleApimInfrastructure
-import utils
 
 
 def create_infrastructure(location: str, index: int, apim_sku: APIM_SKU) -> None:    
+    import utils
+    from infrastructures import SimpleApimInfrastructure
+
     try:
         # Check if infrastructure already exists to determine messaging
         infrastructure_exists = utils.does_resource_group_exist(utils.get_infra_rg_name(utils.INFRASTRUCTURE.SIMPLE_APIM, index))
@@ -0,0 +1,47 @@
+"""
+Helpers for reading JSONC (JSON with comments) files such as VS Code's settings.json, shared by the setup scripts.
+"""
+
+import json
+import re
+from typing import Any
+
+
+# Matches, in one pass of the C regex engine, either a JSON string literal (group 1, kept as-is so that
+# comment markers inside strings survive), a // line comment or a /* */ block comment (an unterminated block
+# comment runs to the end of the content). Line comments stop before the newline so line numbers are preserved.
+_JSONC_RE = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?(?:\*/|\Z)', re.DOTALL)
+
+
+def strip_jsonc(buf: str) -> str:
+    """
+    Strip // line comments and /* */ block comments from JSONC content (e.g. VS Code's settings.json).
+
+    Args:
+        buf (str): The JSONC content
+
+    Returns:
+        str: The content without comments, ready for json.loads
+    """
+
+    return _JSONC_RE.sub(lambda m: m.group(1) or '', buf)
+
+
+# Matches either a JSON string literal (group 1, kept as-is) or a comma that is followed only by whitespace and a closing
+# brace or bracket (group 2 keeps that whitespace and closer). VS Code accepts such trailing commas in settings.json; json.loads does not.
+_TRAILING_COMMA_RE = re.compile(r'("(?:\\.|[^"\\])*")|,(\s*[}\]])')
+
+
+def loads_jsonc(buf: str) -> Any:
+    """
+    Parse JSONC content the way VS Code reads settings.json: comments are ignored and trailing commas are allowed.
+
+    Args:
+        buf (str): The JSONC content
+
+    Returns:
+        Any: The parsed JSON value
+    """
+
+    # Comments are removed first, so that a trailing comma followed by a comment before the closer is still recognized
+    return json.loads(_TRAILING_COMMA_RE.sub(lambda m: m.group(1) or m.group(2), strip_jsonc(buf)))
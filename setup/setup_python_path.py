@@ -17,9 +17,104 @@ is achieved by:
 import sys
 import subprocess
 import os
+import copy
+import importlib.util
+import json
+from functools import lru_cache
 from pathlib import Path  # Cross-platform path handling (Windows: \, Unix: /)
 
+from jsonc import strip_jsonc
 
+
+# The platform does not change while the script runs, so resolve the workspace-relative venv interpreter once
+IS_WINDOWS = os.name == 'nt'
+VENV_PYTHON_PATH = "./.venv/Scripts/python.exe" if IS_WINDOWS else "./.venv/bin/python"
+
+
+class SettingsCommentsError(ValueError):
+    """
+    Raised when settings.json contains comments, which rewriting the file as JSON would remove.
+    """
+
+
+# Parsed settings.json content keyed by (path, st_mtime_ns, st_size) so that repeated reads of an unchanged file skip the read and parse
+_SETTINGS_CACHE: dict[tuple[str, int, int], dict] = {}
+
+
+def _settings_cache_key(settings_file: Path) -> tuple[str, int, int]:
+    """
+    Build the cache key for a settings file from its path, modification time and size.
+    """
+
+    st = os.stat(settings_file)
+    return (str(settings_file), st.st_mtime_ns, st.st_size)
+
+
+def _load_settings(settings_file: Path) -> dict:
+    """
+    Load and parse a settings file, reusing the previous parse when the file has not changed on disk.
+
+    Args:
+        settings_file (Path): Path to the settings.json file
+
+    Returns:
+        dict: A copy of the parsed settings that the caller is free to modify
+
+    Raises:
+        SettingsCommentsError: If the file contains comments. The settings are written back as plain JSON, so a file
+            with comments must not be rewritten.
+    """
+
+    key = _settings_cache_key(settings_file)
+    settings = _SETTINGS_CACHE.get(key)
+
+    if settings is None:
+        with open(settings_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if strip_jsonc(content) != content:
+            raise SettingsCommentsError(f'{settings_file} contains comments')
+
+        settings = json.loads(content)
+        _SETTINGS_CACHE[key] = settings
+
+    return copy.deepcopy(settings)
+
+
+def _save_settings(settings_file: Path, settings: dict) -> None:
+    """
+    Atomically write settings to disk and prime the cache with what was written, so that the next load does not re-parse it.
+    The write is skipped when the file on disk already holds exactly these settings.
+
+    Args:
+        settings_file (Path): Path to the settings.json file
+        settings (dict): The settings to write
+    """
+
+    # The complete setup applies the kernel settings a second time after the VS Code step has already written them,
+    # so compare against the cached parse of the unchanged file before serializing and writing again
+    try:
+        if _SETTINGS_CACHE.get(_settings_cache_key(settings_file)) == settings:
+            return
+    except FileNotFoundError:
+        pass
+
+    # Encode in one go and write to a temporary file that is then renamed over the original, so that an
+    # interrupted run never leaves a truncated settings.json behind
+    data = json.dumps(settings, indent=4, ensure_ascii=False).encode('utf-8')
+    tmp_file = settings_file.with_name(settings_file.name + '.tmp')
+
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_file, settings_file)
+
+    _SETTINGS_CACHE[_settings_cache_key(settings_file)] = copy.deepcopy(settings)
+
+
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """
     Get the absolute path to the project root directory.
@@ -29,6 +124,9 @@ def get_project_root() -> Path:
     - Searches upward from script location to find project indicators
     - Returns absolute paths that work on Windows, macOS, and Linux
     
+    The search only depends on this script's location, so the result is cached and
+    the directory walk happens once per run no matter how many setup steps ask for it.
+    
     Returns:
         Path: Absolute path to project root directory
     """
@@ -38,8 +136,9 @@ def get_project_root() -> Path:
     start_path = Path(__file__).resolve().parent.parent
     
     # Project root indicators - files that should exist at project root
-    # These help identify the correct directory regardless of where script is run
-    indicators = ['README.md', 'requirements.txt', 'bicepconfig.json']
+    # These help identify the correct directory regardless of where script is run.
+    # bicepconfig.json is the least common of the three, so it is checked first and ends the check early on other levels.
+    indicators = ('bicepconfig.json', 'requirements.txt', 'README.md')
     current_path = start_path
     
     # Walk up the directory tree until we find all indicators or reach filesystem root
@@ -118,6 +217,10 @@ SPOTIFY_CLIENT_SECRET=
     print(f"SPOTIFY_CLIENT_SECRET : \n")
 
 
+# Whether install_jupyter_kernel has registered the kernel during this run, so that later steps can skip listing kernelspecs to find it again
+_KERNEL_STATE = {'registered': False}
+
+
 def install_jupyter_kernel():
     """
     Install and register the standardized Jupyter kernel for APIM Samples.
@@ -126,11 +229,8 @@ def install_jupyter_kernel():
     setup, ensuring notebooks have the same kernel regardless of environment.
     """
     
-    try:
-        # Check if ipykernel is available
-        subprocess.run([sys.executable, '-m', 'ipykernel', '--version'], 
-                      check=True, capture_output=True, text=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    # Check if ipykernel is available to this interpreter without starting a second one just to ask
+    if importlib.util.find_spec('ipykernel') is None:
         print("Installing ipykernel...")
         try:
             subprocess.run([sys.executable, '-m', 'pip', 'install', 'ipykernel'], 
@@ -153,6 +253,8 @@ def install_jupyter_kernel():
             f'--display-name={display_name}'
         ], check=True, capture_output=True, text=True)
         
+        _KERNEL_STATE['registered'] = True
+
         print(f"✅ Jupyter kernel registered successfully:")
         print(f"   Name         : {kernel_name}")
         print(f"   Display Name : {display_name}")
@@ -183,8 +285,8 @@ def create_vscode_settings():
     
     # Settings to update for kernel and Python configuration
     required_settings = {
-        "python.defaultInterpreterPath": "./.venv/Scripts/python.exe" if os.name == 'nt' else "./.venv/bin/python",
-        "python.pythonPath": "./.venv/Scripts/python.exe" if os.name == 'nt' else "./.venv/bin/python",
+        "python.defaultInterpreterPath": VENV_PYTHON_PATH,
+        "python.pythonPath": VENV_PYTHON_PATH,
         "python.envFile": "${workspaceFolder}/.env",
         "jupyter.defaultKernel": "apim-samples",
         "jupyter.kernels.filter": [
@@ -213,7 +315,7 @@ def create_vscode_settings():
             "**/bin/python*"
         ],
         "jupyter.kernels.trusted": [
-            "./.venv/Scripts/python.exe" if os.name == 'nt' else "./.venv/bin/python"
+            VENV_PYTHON_PATH
         ],
         "jupyter.preferredKernelIdForNotebook": {
             "*.ipynb": "apim-samples"
@@ -224,45 +326,29 @@ def create_vscode_settings():
     }
     
     # For Windows, also set the default terminal profile
-    if os.name == 'nt':
+    if IS_WINDOWS:
         required_settings["terminal.integrated.defaultProfile.windows"] = "PowerShell"
     
-    # Check if settings.json already exists
-    if settings_file.exists():
-        try:
-            # Read the existing settings file content as text first
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Try to parse as JSON (will fail if it has comments)
-            import json
-            existing_settings = json.loads(content)
-            
-            # Merge required settings with existing ones
-            existing_settings.update(required_settings)
-            
-            # Write back the merged settings
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_settings, f, indent=4)
-            
-            print(f"✅ VS Code settings updated: {settings_file}")
-            print("   - Existing settings preserved")
-            print("   - Default kernel set to 'apim-samples'")
-            print("   - Python interpreter configured for .venv")
-            
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"⚠️  Existing settings.json has comments or formatting issues")
-            print(f"   Please manually add these settings to preserve your existing configuration:")
-            print(f"   - \"jupyter.defaultKernel\": \"apim-samples\"")
-            print(f"   - \"python.defaultInterpreterPath\": \"{required_settings['python.defaultInterpreterPath']}\"")
-            print(f"   - \"python.pythonPath\": \"{required_settings['python.pythonPath']}\"")
-            return False
-    else:
+    # Open settings.json directly rather than checking exists() first; a missing file means it needs to be created
+    try:
+        # Read the existing settings. A file with comments is left alone, as rewriting it would drop them.
+        existing_settings = _load_settings(settings_file)
+        
+        # Merge required settings with existing ones
+        existing_settings.update(required_settings)
+        
+        # Write back the merged settings
+        _save_settings(settings_file, existing_settings)
+        
+        print(f"✅ VS Code settings updated: {settings_file}")
+        print("   - Existing setting values kept (file rewritten as formatted JSON)")
+        print("   - Default kernel set to 'apim-samples'")
+        print("   - Python interpreter configured for .venv")
+        
+    except FileNotFoundError:
         # Create new settings file
         try:
-            import json
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(required_settings, f, indent=4)
+            _save_settings(settings_file, required_settings)
             
             print(f"✅ VS Code settings created: {settings_file}")
             print("   - Default kernel set to 'apim-samples'")
@@ -270,6 +356,14 @@ def create_vscode_settings():
         except (ImportError, IOError) as e:
             print(f"❌ Failed to create VS Code settings: {e}")
             return False
+            
+    except (SettingsCommentsError, json.JSONDecodeError, IOError) as e:
+        print(f"⚠️  Existing settings.json has comments or formatting issues")
+        print(f"   Please manually add these settings to preserve your existing configuration:")
+        print(f"   - \"jupyter.defaultKernel\": \"apim-samples\"")
+        print(f"   - \"python.defaultInterpreterPath\": \"{required_settings['python.defaultInterpreterPath']}\"")
+        print(f"   - \"python.pythonPath\": \"{required_settings['python.pythonPath']}\"")
+        return False
     
     return True
 
@@ -311,8 +405,11 @@ def force_kernel_consistency():
     
     print("🔧 Enforcing kernel consistency...")
     
-    # First, ensure our kernel is registered
-    if not validate_kernel_setup():
+    # First, ensure our kernel is registered. When it was registered earlier in this run (e.g. by the complete setup),
+    # there is no need to start jupyter again just to list kernelspecs.
+    if _KERNEL_STATE['registered']:
+        print("✅ APIM Samples kernel registered earlier in this run")
+    elif not validate_kernel_setup():
         print("⚠️ Kernel not found, attempting to register...")
         if not install_jupyter_kernel():
             print("❌ Failed to register kernel - manual intervention required")
@@ -337,7 +434,7 @@ def force_kernel_consistency():
             "*.ipynb": "apim-samples"
         },
         "jupyter.kernels.trusted": [
-            "./.venv/Scripts/python.exe" if os.name == 'nt' else "./.venv/bin/python"
+            VENV_PYTHON_PATH
         ],
         # Prevent VS Code from auto-detecting other Python environments
         "jupyter.kernels.excludePythonEnvironments": [
@@ -362,23 +459,24 @@ def force_kernel_consistency():
     }
     
     try:
-        import json
-        
         # Read existing settings or create new ones
         existing_settings = {}
-        if settings_file.exists():
-            try:
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    existing_settings = json.load(f)
-            except json.JSONDecodeError:
-                print("⚠️ Existing settings.json has issues, creating new one")
+        try:
+            existing_settings = _load_settings(settings_file)
+        except FileNotFoundError:
+            pass
+        except SettingsCommentsError:
+            print("⚠️ Existing settings.json has comments, which rewriting it would remove")
+            print("   Please manually add the 'apim-samples' kernel settings to preserve your existing configuration")
+            return False
+        except json.JSONDecodeError:
+            print("⚠️ Existing settings.json has issues, creating new one")
         
         # Merge settings, with our strict kernel settings taking priority
         existing_settings.update(strict_kernel_settings)
         
         # Write updated settings
-        with open(settings_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_settings, f, indent=4)
+        _save_settings(settings_file, existing_settings)
         
         print("✅ Strict kernel enforcement settings applied")
         return True
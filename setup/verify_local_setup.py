@@ -13,10 +13,13 @@ Run this after completing the setup to ensure everything is working.
 """
 
 import sys
-import subprocess
 import os
+import re
+from importlib import metadata
 from pathlib import Path
 
+from jsonc import loads_jsonc
+
 
 def print_status(message, success=True):
     """Print status message with colored output."""
@@ -34,15 +37,18 @@ def print_section(title):
 def check_virtual_environment():
     """Check if we're running in the correct virtual environment."""
     venv_path = Path.cwd() / ".venv"
-    if not venv_path.exists():
+    # A single stat answers both whether .venv exists and whether it is a directory
+    if not venv_path.is_dir():
         print_status("Virtual environment (.venv) not found", False)
         return False
     
-    # Check if current Python executable is from the venv
+    # Check if current Python executable is from the venv. Comparing path components rather than string prefixes
+    # keeps a sibling such as '.venv-old' from passing as the workspace venv.
     current_python = Path(sys.executable)
-    expected_venv_python = venv_path / ("Scripts" if os.name == 'nt' else "bin") / "python"
     
-    if not str(current_python).startswith(str(venv_path)):
+    if not current_python.is_relative_to(venv_path):
+        # The expected interpreter path is only needed for the failure message
+        expected_venv_python = venv_path / ("Scripts" if os.name == 'nt' else "bin") / "python"
         print_status(f"Not using virtual environment Python", False)
         print(f"   Current: {current_python}")
         print(f"   Expected: {expected_venv_python}")
@@ -52,9 +58,14 @@ def check_virtual_environment():
     return True
 
 
+def _normalize_distribution_name(name):
+    """Normalize a distribution name per PEP 503 (e.g. 'Python_Dotenv' -> 'python-dotenv')."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
 def check_required_packages():
     """Check if required packages are installed."""
-    # List of (package_name, import_name) tuples
+    # List of (distribution_name, import_name) tuples
     required_packages = [
         ('requests', 'requests'),
         ('ipykernel', 'ipykernel'),
@@ -62,13 +73,20 @@ def check_required_packages():
         ('python-dotenv', 'dotenv')
     ]
     
+    # Packages already imported into this interpreter are installed, so only the rest need a metadata lookup
+    pending = [package_name for package_name, import_name in required_packages if import_name not in sys.modules]
+    
+    # Read the installed distribution metadata once rather than importing each package, which would execute its module code
+    installed = set()
+    if pending:
+        installed = {_normalize_distribution_name(dist.metadata['Name']) for dist in metadata.distributions() if dist.metadata['Name']}
+    
     missing_packages = []
     
-    for package_name, import_name in required_packages:
-        try:
-            __import__(import_name)
+    for package_name, _ in required_packages:
+        if package_name not in pending or _normalize_distribution_name(package_name) in installed:
             print_status(f"{package_name} is installed")
-        except ImportError:
+        else:
             print_status(f"{package_name} is missing", False)
             missing_packages.append(package_name)
     
@@ -102,19 +120,19 @@ def check_shared_modules():
 def check_jupyter_kernel():
     """Check if the APIM Samples Jupyter kernel is registered."""
     try:
-        result = subprocess.run([
-            sys.executable, '-m', 'jupyter', 'kernelspec', 'list'
-        ], capture_output=True, text=True, check=True)
+        # Look up the kernelspecs in-process rather than cold-starting 'jupyter kernelspec list'
+        from jupyter_client.kernelspec import KernelSpecManager
         
-        if 'apim-samples' in result.stdout:
+        if 'apim-samples' in KernelSpecManager().find_kernel_specs():
             print_status("APIM Samples Jupyter kernel is registered")
             return True
         else:
             print_status("APIM Samples Jupyter kernel not found", False)
             return False
             
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print_status("Could not check Jupyter kernel registration", False)
+    except Exception as e:
+        # Covers a missing jupyter_client as well as invalid Jupyter configuration, which traitlets reports with its own error types
+        print_status(f"Could not check Jupyter kernel registration: {e}", False)
         return False
 
 
@@ -122,15 +140,12 @@ def check_vscode_settings():
     """Check if VS Code settings are configured."""
     vscode_settings = Path.cwd() / '.vscode' / 'settings.json'
     
-    if not vscode_settings.exists():
-        print_status("VS Code settings.json not found", False)
-        return False
-    
     try:
-        with open(vscode_settings, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Open the file directly rather than checking exists() first; a missing file surfaces as FileNotFoundError.
+        # settings.json is JSONC (comments and trailing commas), so parse it as such once; a setting that only appears in a comment does not count.
+        settings = loads_jsonc(vscode_settings.read_text(encoding='utf-8'))
         
-        # Check for key settings (simple string search since the file may have comments)
+        # Check for key settings
         checks = [
             ('jupyter.defaultKernel', 'apim-samples'),
             ('python.defaultInterpreterPath', '.venv'),
@@ -139,7 +154,7 @@ def check_vscode_settings():
         
         all_found = True
         for setting_key, expected_value in checks:
-            if setting_key not in content or expected_value not in content:
+            if expected_value not in str(settings.get(setting_key, '')):
                 print_status(f"VS Code setting '{setting_key}' not properly configured", False)
                 all_found = False
         
@@ -149,6 +164,9 @@ def check_vscode_settings():
         else:
             return False
             
+    except FileNotFoundError:
+        print_status("VS Code settings.json not found", False)
+        return False
     except Exception as e:
         print_status(f"Could not read VS Code settings: {e}", False)
         return False
@@ -158,21 +176,20 @@ def check_env_file():
     """Check if .env file exists and has correct configuration."""
     env_file = Path.cwd() / '.env'
     
-    if not env_file.exists():
-        print_status(".env file not found", False)
-        return False
-    
     try:
-        with open(env_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read the raw bytes in one call and search them directly; both markers are ASCII, so no decode is needed
+        content = env_file.read_bytes()
         
-        if 'PYTHONPATH=' in content and 'PROJECT_ROOT=' in content:
+        if b'PYTHONPATH=' in content and b'PROJECT_ROOT=' in content:
             print_status(".env file is configured correctly")
             return True
         else:
             print_status(".env file missing required configuration", False)
             return False
             
+    except FileNotFoundError:
+        print_status(".env file not found", False)
+        return False
     except Exception as e:
         print_status(f"Could not read .env file: {e}", False)
         return False
@@ -6,6 +6,8 @@ import json
 import time
 import requests
 import utils
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from apimtypes import HTTP_VERB, SUBSCRIPTION_KEY_PARAMETER_NAME, SLEEP_TIME_BETWEEN_REQUESTS_MS
 
@@ -37,6 +39,7 @@ class ApimRequests:
         self.url = url
         self.apimSubscriptionKey = apimSubscriptionKey
         self._headers: dict[str, str] = {}
+        self._session: requests.Session | None = None
 
         if self.apimSubscriptionKey:
             self._headers[SUBSCRIPTION_KEY_PARAMETER_NAME] = self.apimSubscriptionKey
@@ -71,6 +74,20 @@ class ApimRequests:
     #    PRIVATE METHODS
     # ------------------------------
 
+    def _get_session(self) -> requests.Session:
+        """
+        Get the session used for single requests, creating it on first use.
+        Reusing one session keeps the connection to the APIM gateway alive, so consecutive requests skip the TCP and TLS handshakes.
+
+        Returns:
+            requests.Session: The session shared by single requests.
+        """
+
+        if self._session is None:
+            self._session = requests.Session()
+
+        return self._session
+
     def _request(self, method: HTTP_VERB, path: str, headers: list[any] = None, data: any = None, msg: str | None = None, printResponse: bool = True) -> str | None:
         """
         Make a request to the Azure API Management service.
@@ -102,19 +119,21 @@ class ApimRequests:
             if headers:
                 merged_headers.update(headers)
 
-            response = requests.request(method.value, url, headers = merged_headers, json = data)
+            response = self._get_session().request(method.value, url, headers = merged_headers, json = data)
             
             content_type = response.headers.get('Content-Type')
 
             responseBody = None
+            prettyBody = None
 
             if content_type and 'application/json' in content_type:
-                responseBody = json.dumps(response.json(), indent = 4)
+                responseBody = prettyBody = json.dumps(response.json(), indent = 4)
             else:
                 responseBody = response.text
 
             if printResponse:
-                self._print_response(response)
+                # Hand over the body that was just formatted so that it is not parsed and serialized a second time for printing
+                self._print_response(response, pretty_body = prettyBody)
 
             return responseBody
 
@@ -122,7 +141,7 @@ class ApimRequests:
             utils.print_error(f'Error making request: {e}')
             return None
         
-    def _multiRequest(self, method: HTTP_VERB, path: str, runs: int, headers: list[any] = None, data: any = None, msg: str | None = None, printResponse: bool = True, sleepMs: int | None = None) -> list[dict[str, Any]]:
+    def _multiRequest(self, method: HTTP_VERB, path: str, runs: int, headers: list[any] = None, data: any = None, msg: str | None = None, printResponse: bool = True, sleepMs: int | None = None, concurrency: int = 1) -> list[dict[str, Any]]:
         """
         Make multiple requests to the Azure API Management service.
 
@@ -134,16 +153,33 @@ class ApimRequests:
             data: Data to include in the request body.
             printResponse: Whether to print the returned output.
             sleepMs: Optional sleep time between requests in milliseconds (0 to not sleep).
+            concurrency: The number of requests to have in flight at once (at least 1). Above 1, all runs are sent up front without sleeping in between.
 
         Returns:
             List of response dicts for each run.
+
+        Raises:
+            ValueError: If concurrency is less than 1.
+
+        Note:
+            Concurrent runs share one requests.Session, which requests does not document as thread-safe. This is safe here only because
+            the session is private to this batch and is not mutated while the runs are in flight; its connection pool is sized to the
+            concurrency so that no connection is discarded.
         """
 
+        if concurrency < 1:
+            raise ValueError(f'concurrency must be at least 1, got {concurrency}')
+
         api_runs = []
 
         session = requests.Session()
         session.headers.update(self.headers.copy())
 
+        # Keep one pooled connection per in-flight request; the default pool of 10 would drop and reopen connections above that
+        adapter = HTTPAdapter(pool_maxsize = concurrency)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
         try:
             if msg:
                 utils.print_message(msg, blank_above = True)
@@ -155,12 +191,24 @@ class ApimRequests:
             url = self.url + path
             utils.print_info(f'{method.value} {url}')
 
+            def send() -> tuple[requests.Response, float]:
+                # Time the request on the monotonic performance counter so that wall clock adjustments cannot skew the measurement
+                start_time = time.perf_counter_ns()
+                response = session.request(method.value, url, json = data)
+                return response, (time.perf_counter_ns() - start_time) / 1e9
+
+            # With concurrency, send every run on the shared session up front and report the results in run order below
+            concurrent_results = None
+
+            if concurrency > 1:
+                with ThreadPoolExecutor(max_workers = concurrency) as executor:
+                    futures = [executor.submit(send) for _ in range(runs)]
+                    concurrent_results = [future.result() for future in futures]
+
             for i in range(runs):
                 utils.print_info(f'▶️ Run {i + 1}/{runs}:')
 
-                start_time = time.time()
-                response = session.request(method.value, url, json = data)
-                response_time = time.time() - start_time
+                response, response_time = concurrent_results[i] if concurrent_results else send()
                 utils.print_info(f'⌚ {response_time:.2f} seconds')
 
                 self._print_response_code(response)
@@ -179,6 +227,9 @@ class ApimRequests:
                     'response_time': response_time
                 })
 
+                if concurrent_results:
+                    continue
+
                 if sleepMs is not None:
                     if sleepMs > 0:
                         time.sleep(sleepMs / 1000) 
@@ -189,15 +240,23 @@ class ApimRequests:
 
         return api_runs
 
-    def _print_response(self, response) -> None:
+    def _print_response(self, response, pretty_body: str | None = None) -> None:
         """
         Print the response headers and body with appropriate formatting.
+
+        Args:
+            response: The response to print.
+            pretty_body: The JSON body already formatted by the caller, if any. It is printed as-is for 200 responses instead of parsing the body again.
         """
 
         self._print_response_code(response)
         utils.print_val('Response headers', response.headers, True)
 
         if response.status_code == 200:
+            if pretty_body is not None:
+                utils.print_val('Response body', pretty_body, True)
+                return
+
             try:
                 data = json.loads(response.text)
                 utils.print_val('Response body', json.dumps(data, indent = 4), True)
@@ -262,6 +321,30 @@ class ApimRequests:
     #    PUBLIC METHODS
     # ------------------------------
 
+    def close(self) -> None:
+        """
+        Close the session used for single requests and release its pooled connections.
+        A later request opens a new session.
+        """
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self) -> 'ApimRequests':
+        """
+        Use the object as a context manager that closes its session on exit.
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Close the session when leaving the context.
+        """
+
+        self.close()
+
     def singleGet(self, path: str, headers = None, msg: str | None = None, printResponse: bool = True) -> Any:
         """
         Make a GET request to the Azure API Management service.
@@ -293,7 +376,7 @@ class ApimRequests:
 
         return self._request(method = HTTP_VERB.POST, path = path, headers = headers, data = data, msg = msg, printResponse = printResponse)
     
-    def multiGet(self, path: str, runs: int, headers = None, data = None, msg: str | None = None, printResponse: bool = True, sleepMs: int | None = None) -> list[dict[str, Any]]:
+    def multiGet(self, path: str, runs: int, headers = None, data = None, msg: str | None = None, printResponse: bool = True, sleepMs: int | None = None, concurrency: int = 1) -> list[dict[str, Any]]:
         """
         Make multiple GET requests to the Azure API Management service.
 
@@ -304,12 +387,16 @@ class ApimRequests:
             data: Data to include in the request body.
             printResponse: Whether to print the returned output.
             sleepMs: Optional sleep time between requests in milliseconds (0 to not sleep).
+            concurrency: The number of requests to have in flight at once (default 1, one after another).
 
         Returns:
             List of response dicts for each run.
+
+        Raises:
+            ValueError: If concurrency is less than 1.
         """
 
-        return self._multiRequest(method = HTTP_VERB.GET, path = path, runs = runs, headers = headers, data = data, msg = msg, printResponse = printResponse, sleepMs = sleepMs)
+        return self._multiRequest(method = HTTP_VERB.GET, path = path, runs = runs, headers = headers, data = data, msg = msg, printResponse = printResponse, sleepMs = sleepMs, concurrency = concurrency)
     
     def singlePostAsync(self, path: str, *, headers = None, data = None, msg: str | None = None, printResponse = True, timeout = 60, poll_interval = 2) -> Any:
         """
@@ -45,15 +45,21 @@ API_ID_XML_POLICY_PATH          = str(_SHARED_XML_POLICY_BASE_PATH / 'api-id.xml
 SUBSCRIPTION_KEY_PARAMETER_NAME = 'api-key'
 SLEEP_TIME_BETWEEN_REQUESTS_MS  = 50
 
+# Schema of the ARM deployment parameters file (params.json) passed to 'az deployment group create'
+BICEP_PARAMETERS_SCHEMA         = 'https://schema.management.azure.com/schemas/2019-04-01/deploymentParameters.json#'
+
 
 # ------------------------------
 #    PRIVATE METHODS
 # ------------------------------
 
-# Placing this here privately as putting it into the utils module would constitute a circular import
-def _read_policy_xml(policy_xml_filepath: str) -> str:
+# Policy XML file contents keyed by path and validated against (st_mtime_ns, st_size), so that unchanged policy files are only read from disk once per process
+_policy_xml_cache: dict[str, tuple[int, int, str]] = {}
+
+# Placed here rather than in the utils module, which imports apimtypes, to avoid a circular import. utils.read_policy_xml builds on it.
+def read_policy_xml_file(policy_xml_filepath: str) -> str:
     """
-    Read and return the contents of a policy XML file.
+    Read and return the contents of a policy XML file, reusing the cached contents while the file is unchanged on disk.
 
     Args:
         policy_xml_filepath (str): Path to the policy XML file.
@@ -62,10 +68,25 @@ def _read_policy_xml(policy_xml_filepath: str) -> str:
         str: Contents of the policy XML file.
     """
 
+    try:
+        st = os.stat(policy_xml_filepath)
+    except OSError:
+        # Nothing to validate a cache entry against; let open() surface the error (or succeed) as before
+        st = None
+
+    if st is not None:
+        cached = _policy_xml_cache.get(policy_xml_filepath)
+
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
     # Read the specified policy XML file with explicit UTF-8 encoding
     with open(policy_xml_filepath, 'r', encoding = 'utf-8') as policy_xml_file:
         policy_template_xml = policy_xml_file.read()
 
+    if st is not None:
+        _policy_xml_cache[policy_xml_filepath] = (st.st_mtime_ns, st.st_size, policy_template_xml)
+
     return policy_template_xml
 
 
@@ -165,7 +186,7 @@ class API:
         self.displayName = displayName
         self.path = path
         self.description = description
-        self.policyXml = policyXml if policyXml is not None else _read_policy_xml(DEFAULT_XML_POLICY_PATH)
+        self.policyXml = policyXml if policyXml is not None else read_policy_xml_file(DEFAULT_XML_POLICY_PATH)
         self.operations = operations if operations is not None else []
         self.tags = tags if tags is not None else []
         self.productNames = productNames if productNames is not None else []
@@ -221,7 +242,7 @@ class APIOperation:
         self.method = method
         self.urlTemplate = urlTemplate
         self.description = description
-        self.policyXml = policyXml if policyXml is not None else _read_policy_xml(DEFAULT_XML_POLICY_PATH)
+        self.policyXml = policyXml if policyXml is not None else read_policy_xml_file(DEFAULT_XML_POLICY_PATH)
         self.templateParameters = templateParameters if templateParameters is not None else []    
         
     # ------------------------------
@@ -380,7 +401,7 @@ class Product:
         # Only try to read default policy if policyXml is None and we're not in a test environment
         if policyXml is None:
             try:
-                self.policyXml = _read_policy_xml(DEFAULT_XML_POLICY_PATH)
+                self.policyXml = read_policy_xml_file(DEFAULT_XML_POLICY_PATH)
             except FileNotFoundError:
                 # Fallback to a simple default policy for testing or when file is not found
                 self.policyXml = """<policies>
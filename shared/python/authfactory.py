@@ -29,7 +29,7 @@ class JwtPayload:
     #    CONSTRUCTOR
     # ------------------------------
 
-    def __init__(self, subject: str, name: str, issued_at: int | None = None, expires: int | None = None, roles: dict[str] | None = None) -> None:
+    def __init__(self, subject: str, name: str, issued_at: int | None = None, expires: int | None = None, roles: list[str] | None = None) -> None:
         self.sub = subject
         self.name = name        
         self.iat = issued_at if issued_at is not None else int(time.time())
@@ -52,7 +52,7 @@ class JwtPayload:
             'exp': self.exp
         } 
 
-        if bool(self.roles):
+        if self.roles:
             pl['roles'] = self.roles
 
         return pl
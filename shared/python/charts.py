@@ -7,7 +7,6 @@ This module will likely be moved to the /shared/python directory in the future o
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle as pltRectangle
-import matplotlib as mpl
 import json
 
 
@@ -91,28 +90,26 @@ class BarChart(object):
 
         df = pd.DataFrame(rows)
 
-        mpl.rcParams['figure.figsize'] = [15, 7]
+        # Compute the 200 status mask once; the color map, bar colors and mean line all select on it
+        is_200 = df['Status Code'] == 200
 
         # Define a color map for each backend index (200) and errors (non-200 always lightcoral)
-        backend_indexes_200 = sorted(df[df['Status Code'] == 200]['Backend Index'].unique())
+        backend_indexes_200 = sorted(df[is_200]['Backend Index'].unique())
         color_palette = ['lightyellow', 'lightblue', 'lightgreen', 'plum', 'orange']
         color_map_200 = {idx: color_palette[i % len(color_palette)] for i, idx in enumerate(backend_indexes_200)}
 
-        bar_colors = []
-        for _, row in df.iterrows():
-            if row['Status Code'] == 200:
-                bar_colors.append(color_map_200.get(row['Backend Index'], 'gray'))
-            else:
-                bar_colors.append('lightcoral')
+        # Assign all bar colors in one vectorized pass rather than iterating rows: backend color for 200s, lightcoral otherwise
+        bar_colors = df['Backend Index'].map(color_map_200).fillna('gray').where(is_200, 'lightcoral').tolist()
 
-        # Plot the dataframe with colored bars
+        # Plot the dataframe with colored bars. The size is set on this figure only rather than through the global rcParams.
         ax = df.plot(
             kind='bar',
             x='Run',
             y='Response Time (ms)',
             color=bar_colors,
             legend=False,
-            edgecolor='black'
+            edgecolor='black',
+            figsize=(15, 7)
         )
 
         # Add dynamic legend based on backend indexes present in the data
@@ -130,20 +127,22 @@ class BarChart(object):
         plt.ylabel(self.y_label)
         plt.xticks(rotation = 0)
 
-        # Exclude high outliers for average calculation
-        valid_200 = df[(df['Status Code'] == 200)].copy()
-        if not valid_200.empty:
+        # Exclude high outliers for average calculation, working on the 200 response time column alone rather than a copied frame
+        response_times_200 = df.loc[is_200, 'Response Time (ms)']
+        if not response_times_200.empty:
             # Exclude high outliers (e.g., above 95th percentile)
-            if not valid_200.empty:
-                upper = valid_200['Response Time (ms)'].quantile(0.95)
-                filtered = valid_200[valid_200['Response Time (ms)'] <= upper]
-                if not filtered.empty:
-                    avg = filtered['Response Time (ms)'].mean()
-                    avg_label = f'Mean APIM response time: {avg:.1f} ms'
-                    plt.axhline(y = avg, color = 'b', linestyle = '--')
-                    plt.text(len(df) - 1, avg, avg_label, color = 'b', va = 'bottom', ha = 'right', fontsize = 10)
+            upper = response_times_200.quantile(0.95)
+            filtered = response_times_200[response_times_200 <= upper]
+            if not filtered.empty:
+                avg = filtered.mean()
+                avg_label = f'Mean APIM response time: {avg:.1f} ms'
+                plt.axhline(y = avg, color = 'b', linestyle = '--')
+                plt.text(len(df) - 1, avg, avg_label, color = 'b', va = 'bottom', ha = 'right', fontsize = 10)
 
         # Add figtext under the chart
         plt.figtext(0.13, -0.1, wrap = True, ha = 'left', fontsize = 11, s = self.fig_text)
 
-        plt.show()
\ No newline at end of file
+        plt.show()
+
+        # Release the figure once shown so that repeated charts in a notebook session do not accumulate open figures
+        plt.close(ax.figure)
\ No newline at end of file
@@ -4,12 +4,42 @@ Infrastructure Types
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from apimtypes import *
+from typing import List
+from apimtypes import API, APIM_SKU, APIMNetworkMode, BICEP_PARAMETERS_SCHEMA, GET_APIOperation, HELLO_WORLD_XML_POLICY_PATH, INFRASTRUCTURE, PolicyFragment
 import utils
 from utils import Output
 
 
+# ------------------------------
+#    CONSTANTS
+# ------------------------------
+
+# Upper bound on the az CLI processes run at once when approving private link connections
+MAX_PARALLEL_APPROVALS = 8
+
+# Absolute path of the infrastructure/ directory, resolved once from shared/python/
+INFRASTRUCTURE_ROOT = Path(__file__).resolve().parent.parent.parent / 'infrastructure'
+
+# Map infrastructure types to their directory names under infrastructure/
+INFRASTRUCTURE_DIRECTORIES = {
+    INFRASTRUCTURE.SIMPLE_APIM: 'simple-apim',
+    INFRASTRUCTURE.APIM_ACA: 'apim-aca',
+    INFRASTRUCTURE.AFD_APIM_PE: 'afd-apim-pe'
+}
+
+# (name, shared fragment file, description) for the policy fragments deployed to every infrastructure
+BASE_POLICY_FRAGMENTS = (
+    ('Api-Id',                 'pf-api-id.xml',                 'Extracts a specific API identifier for tracing.'),
+    ('AuthZ-Match-All',        'pf-authz-match-all.xml',        'Authorizes if all of the specified roles match the JWT role claims.'),
+    ('AuthZ-Match-Any',        'pf-authz-match-any.xml',        'Authorizes if any of the specified roles match the JWT role claims.'),
+    ('Http-Response-200',      'pf-http-response-200.xml',      'Returns a 200 OK response for the current HTTP method.'),
+    ('Product-Match-Any',      'pf-product-match-any.xml',      'Proceeds if any of the specified products match the context product name.'),
+    ('Remove-Request-Headers', 'pf-remove-request-headers.xml', 'Removes request headers from the incoming request.')
+)
+
+
 # ------------------------------
 #    INFRASTRUCTURE CLASSES
 # ------------------------------
@@ -50,6 +80,48 @@ class Infrastructure:
         }
 
         return self.bicep_parameters
+
+    def _get_bicep_parameters_file_path(self, infra_dir: Path) -> Path:
+        """
+        Get the path of the ARM deployment parameters file for this infrastructure index.
+
+        Args:
+            infra_dir (Path): The infrastructure directory containing main.bicep.
+
+        Returns:
+            Path: The index-specific parameters file path, so that concurrent deployments of different indexes do not share a file.
+        """
+
+        return infra_dir / f'params-{self.index}.json'
+
+    def _write_bicep_parameters_file(self, params_file_path: Path) -> None:
+        """
+        Write the Bicep parameters to an ARM deployment parameters file.
+
+        Args:
+            params_file_path (Path): Path of the parameters file to write.
+        """
+
+        bicep_parameters_format = {
+            '$schema': BICEP_PARAMETERS_SCHEMA,
+            'contentVersion': '1.0.0.0',
+            'parameters': self.bicep_parameters
+        }
+
+        # Encode before touching the file system, so that a serialization error cannot leave a stray temporary file behind
+        content = json.dumps(bicep_parameters_format)
+
+        # Write to a process-specific temporary file and swap it into place, so that az never reads a partially written parameters file
+        tmp_file_path = params_file_path.with_name(f'{params_file_path.name}.{os.getpid()}.tmp')
+
+        try:
+            with open(tmp_file_path, 'w') as file:
+                file.write(content)
+
+            os.replace(tmp_file_path, params_file_path)
+        except BaseException:
+            tmp_file_path.unlink(missing_ok = True)
+            raise
     
 
     def _define_policy_fragments(self) -> List[PolicyFragment]:
@@ -57,14 +129,10 @@ class Infrastructure:
         Define policy fragments for the infrastructure.
         """
 
-        # The base policy fragments common to all infrastructures
+        # The base policy fragments common to all infrastructures; repeat reads of unchanged XML files are served from utils' policy file cache
         self.base_pfs = [
-            PolicyFragment('Api-Id', utils.read_policy_xml(utils.determine_shared_policy_path('pf-api-id.xml')), 'Extracts a specific API identifier for tracing.'),
-            PolicyFragment('AuthZ-Match-All', utils.read_policy_xml(utils.determine_shared_policy_path('pf-authz-match-all.xml')), 'Authorizes if all of the specified roles match the JWT role claims.'),
-            PolicyFragment('AuthZ-Match-Any', utils.read_policy_xml(utils.determine_shared_policy_path('pf-authz-match-any.xml')), 'Authorizes if any of the specified roles match the JWT role claims.'),
-            PolicyFragment('Http-Response-200', utils.read_policy_xml(utils.determine_shared_policy_path('pf-http-response-200.xml')), 'Returns a 200 OK response for the current HTTP method.'),
-            PolicyFragment('Product-Match-Any', utils.read_policy_xml(utils.determine_shared_policy_path('pf-product-match-any.xml')), 'Proceeds if any of the specified products match the context product name.'),
-            PolicyFragment('Remove-Request-Headers', utils.read_policy_xml(utils.determine_shared_policy_path('pf-remove-request-headers.xml')), 'Removes request headers from the incoming request.')
+            PolicyFragment(name, utils.read_policy_xml(utils.determine_shared_policy_path(filename)), description)
+            for name, filename, description in BASE_POLICY_FRAGMENTS
         ]
 
         # Combine base policy fragments with infrastructure-specific ones
@@ -89,12 +157,14 @@ class Infrastructure:
 
         return self.apis
 
-    def _verify_infrastructure(self, rg_name: str) -> bool:
+    def _verify_infrastructure(self, rg_name: str, apim_name: str | None = None) -> bool:
         """
         Verify that the infrastructure was created successfully.
         
         Args:
             rg_name (str): Resource group name.
+            apim_name (str, optional): APIM service name reported by the deployment outputs. When provided, the resource group and APIM
+                service lookups are skipped, as a successful deployment that created the service already proves both exist.
             
         Returns:
             bool: True if verification passed, False otherwise.
@@ -103,51 +173,58 @@ class Infrastructure:
         print('\n🔍 Verifying infrastructure...')
         
         try:
-            # Check if the resource group exists
-            if not utils.does_resource_group_exist(rg_name):
-                print('❌ Resource group does not exist!')
-                return False
-            
-            print('✅ Resource group verified')
-            
-            # Get APIM service details
-            output = utils.run(f'az apim list -g {rg_name} --query "[0]" -o json', print_command_to_run = False, print_errors = False)
-            
-            if output.success and output.json_data:
-                apim_name = output.json_data.get('name')
-                
-                print(f'✅ APIM Service verified: {apim_name}')
+            if apim_name is None:
+                # Check if the resource group exists
+                if not utils.does_resource_group_exist(rg_name):
+                    print('❌ Resource group does not exist!')
+                    return False
                 
-                # Get API count
-                api_output = utils.run(f'az apim api list --service-name {apim_name} -g {rg_name} --query "length(@)"', 
-                                    print_command_to_run = False, print_errors = False)
+                print('✅ Resource group verified')
                 
-                if api_output.success:
-                    api_count = int(api_output.text.strip())
-                    print(f'✅ APIs verified: {api_count} API(s) created')
-                    
-                    # Test basic connectivity (optional)
-                    if api_count > 0:
-                        try:
-                            # Get subscription key for testing
-                            sub_output = utils.run(f'az apim subscription list --service-name {apim_name} -g {rg_name} --query "[0].primaryKey" -o tsv', 
-                                                print_command_to_run = False, print_errors = False)
-                            
-                            if sub_output.success and sub_output.text.strip():
-                                print('✅ Subscription key available for API testing')
-                        except:
-                            pass
+                # Get the APIM service name as plain text; the name is all that is needed, so there is no JSON document to emit or parse
+                output = utils.run(f'az apim list -g {rg_name} --query "[0].name" -o tsv', print_command_to_run = False, print_errors = False)
+                apim_name = output.text.strip() if output.success else ''
                 
-                # Call infrastructure-specific verification
-                if self._verify_infrastructure_specific(rg_name):
-                    print('\n🎉 Infrastructure verification completed successfully!')
-                    return True
-                else:
-                    print('\n❌ Infrastructure-specific verification failed!')
+                if not apim_name:
+                    print('\n❌ APIM service not found!')
                     return False
+            else:
+                print('✅ Resource group verified (from deployment outputs)')
+            
+            print(f'✅ APIM Service verified: {apim_name}')
+            
+            # The API count and subscription key lookups only need the service name, and the infrastructure-specific checks only the
+            # resource group, so run them all concurrently. The specific checks print their results before the API results below.
+            with ThreadPoolExecutor(max_workers = 3) as executor:
+                api_future = executor.submit(utils.run, f'az apim api list --service-name {apim_name} -g {rg_name} --query "length(@)"',
+                                             print_command_to_run = False, print_errors = False)
+                sub_future = executor.submit(utils.run, f'az apim subscription list --service-name {apim_name} -g {rg_name} --query "[0].primaryKey" -o tsv',
+                                             print_command_to_run = False, print_errors = False)
+                specific_future = executor.submit(self._verify_infrastructure_specific, rg_name)
+
+            api_output = api_future.result()
+            
+            if api_output.success:
+                api_count = int(api_output.text.strip())
+                print(f'✅ APIs verified: {api_count} API(s) created')
                 
+                # Test basic connectivity (optional)
+                if api_count > 0:
+                    try:
+                        # Get subscription key for testing
+                        sub_output = sub_future.result()
+                        
+                        if sub_output.success and sub_output.text.strip():
+                            print('✅ Subscription key available for API testing')
+                    except:
+                        pass
+            
+            # Report the infrastructure-specific verification
+            if specific_future.result():
+                print('\n🎉 Infrastructure verification completed successfully!')
+                return True
             else:
-                print('\n❌ APIM service not found!')
+                print('\n❌ Infrastructure-specific verification failed!')
                 return False
                 
         except Exception as e:
@@ -178,7 +255,8 @@ class Infrastructure:
         This method should be implemented in subclasses to handle specific deployment logic.
         
         Args:
-            is_update (bool): Whether this is an update to existing infrastructure or a new deployment.
+            is_update (bool): Whether this is an update to existing infrastructure or a new deployment. An update assumes
+                the resource group already exists and skips creating it.
         """
         
         action_verb = "Updating" if is_update else "Creating"
@@ -194,88 +272,63 @@ class Infrastructure:
         self._define_bicep_parameters()
 
         # Determine the correct infrastructure directory based on the infrastructure type
-        original_cwd = os.getcwd()
-        
-        # Map infrastructure types to their directory names
-        infra_dir_map = {
-            INFRASTRUCTURE.SIMPLE_APIM: 'simple-apim',
-            INFRASTRUCTURE.APIM_ACA: 'apim-aca', 
-            INFRASTRUCTURE.AFD_APIM_PE: 'afd-apim-pe'
-        }
-        
-        # Get the infrastructure directory
-        infra_dir_name = infra_dir_map.get(self.infra)
+        infra_dir_name = INFRASTRUCTURE_DIRECTORIES.get(self.infra)
         if not infra_dir_name:
             raise ValueError(f"Unknown infrastructure type: {self.infra}")
             
-        # Navigate to the correct infrastructure directory
-        # From shared/python -> ../../infrastructure/{infra_type}/
-        shared_dir = Path(__file__).parent
-        infra_dir = shared_dir.parent.parent / 'infrastructure' / infra_dir_name
+        # Use absolute paths for the template and parameters file, so the process-wide working directory never changes
+        infra_dir = INFRASTRUCTURE_ROOT / infra_dir_name
 
-        try:
-            os.chdir(infra_dir)
-            print(f'📁 Changed working directory to: {infra_dir}')
-            
-            # Prepare deployment parameters and run directly to avoid path detection issues
-            bicep_parameters_format = {
-                '$schema': 'https://schema.management.azure.com/schemas/2019-04-01/deploymentParameters.json#',
-                'contentVersion': '1.0.0.0',
-                'parameters': self.bicep_parameters
-            }
-            
-            # Write the parameters file
-            params_file_path = infra_dir / 'params.json'
-
-            with open(params_file_path, 'w') as file:            
-                file.write(json.dumps(bicep_parameters_format))
-            
-            print(f"📝 Updated the policy XML in the bicep parameters file 'params.json'")
-            
-            # ------------------------------
-            #    EXECUTE DEPLOYMENT
-            # ------------------------------
-            
-            # Create the resource group if it doesn't exist
+        # Write the deployment parameters file and run directly to avoid path detection issues
+        params_file_path = self._get_bicep_parameters_file_path(infra_dir)
+        self._write_bicep_parameters_file(params_file_path)
+        
+        print(f"📝 Updated the policy XML in the bicep parameters file '{params_file_path.name}'")
+        
+        # ------------------------------
+        #    EXECUTE DEPLOYMENT
+        # ------------------------------
+        
+        # Create the resource group if it doesn't exist. Updates target a resource group the caller has already found, so skip the extra lookup.
+        if not is_update:
             utils.create_resource_group(self.rg_name, self.rg_location, self.rg_tags)
-            
-            # Run the deployment directly
-            main_bicep_path = infra_dir / 'main.bicep'
-            output = utils.run(
-                f'az deployment group create --name {self.infra.value} --resource-group {self.rg_name} --template-file "{main_bicep_path}" --parameters "{params_file_path}" --query "properties.outputs"',
-                f"Deployment '{self.infra.value}' succeeded", 
-                f"Deployment '{self.infra.value}' failed.",
-                print_command_to_run = False
-            )
-            
-            # ------------------------------
-            #    VERIFY DEPLOYMENT RESULTS
-            # ------------------------------
-            
-            if output.success:
-                print('\n✅ Infrastructure creation completed successfully!')
-                if output.json_data:
-                    apim_gateway_url = output.get('apimResourceGatewayURL', 'APIM API Gateway URL', suppress_logging = True)
-                    apim_apis = output.getJson('apiOutputs', 'APIs', suppress_logging = True)
-                    
-                    print(f'\n📋 Infrastructure Details:')
-                    print(f'   Resource Group : {self.rg_name}')
-                    print(f'   Location       : {self.rg_location}')
-                    print(f'   APIM SKU       : {self.apim_sku.value}')
-                    print(f'   Gateway URL    : {apim_gateway_url}')
-                    print(f'   APIs Created   : {len(apim_apis)}')
-                    
-                    # TODO: Perform basic verification
-                    self._verify_infrastructure(self.rg_name)
-            else:
-                print('❌ Infrastructure creation failed!')
+        
+        # Run the deployment directly
+        main_bicep_path = infra_dir / 'main.bicep'
+        output = utils.run(
+            ['az', 'deployment', 'group', 'create', '--name', self.infra.value, '--resource-group', self.rg_name,
+             '--template-file', str(main_bicep_path), '--parameters', str(params_file_path), '--query', 'properties.outputs'],
+            f"Deployment '{self.infra.value}' succeeded", 
+            f"Deployment '{self.infra.value}' failed.",
+            print_command_to_run = False
+        )
+        
+        # ------------------------------
+        #    VERIFY DEPLOYMENT RESULTS
+        # ------------------------------
+        
+        if output.success:
+            print('\n✅ Infrastructure creation completed successfully!')
+            if output.json_data:
+                apim_gateway_url = output.get('apimResourceGatewayURL', 'APIM API Gateway URL', suppress_logging = True)
+                apim_apis = output.getJson('apiOutputs', 'APIs', suppress_logging = True)
                 
-            return output
+                print(f'\n📋 Infrastructure Details:')
+                print(f'   Resource Group : {self.rg_name}')
+                print(f'   Location       : {self.rg_location}')
+                print(f'   APIM SKU       : {self.apim_sku.value}')
+                print(f'   Gateway URL    : {apim_gateway_url}')
+                print(f'   APIs Created   : {len(apim_apis)}')
+                
+                # TODO: Perform basic verification
+                # Pass the APIM name along when the template outputs it; otherwise verification looks it up. Check for the key first,
+                # as Output.get reports a missing key as an error.
+                apim_name = output.get('apimServiceName', suppress_logging = True) if 'apimServiceName' in output.json_data else None
+                self._verify_infrastructure(self.rg_name, apim_name)
+        else:
+            print('❌ Infrastructure creation failed!')
             
-        finally:
-            # Always restore the original working directory
-            os.chdir(original_cwd)
-            print(f'📁 Restored working directory to: {original_cwd}')
+        return output
 
 
 class SimpleApimInfrastructure(Infrastructure):
@@ -371,12 +424,9 @@ class AfdApimAcaInfrastructure(Infrastructure):
                 print('❌ Failed to retrieve private endpoint connections')
                 return False
                 
+            # The JMESPath filter expression always yields a list, even for a single match
             pending_connections = output.json_data if output.is_json else []
-            
-            # Handle both single object and list
-            if isinstance(pending_connections, dict):
-                pending_connections = [pending_connections]
-            
+
             total = len(pending_connections)
             print(f'   Found {total} pending private link service connection(s)')
             
@@ -384,21 +434,32 @@ class AfdApimAcaInfrastructure(Infrastructure):
                 print('   ✅ No pending connections found - may already be approved')
                 return True
                 
-            # Approve each pending connection
-            for i, conn in enumerate(pending_connections, 1):
-                conn_id = conn.get('id')
-                conn_name = conn.get('name', '<unknown>')
-                print(f'   Approving {i}/{total}: {conn_name}')
-                
-                approve_result = utils.run(
-                    f'az network private-endpoint-connection approve --id {conn_id} --description "Approved by infrastructure deployment"',
-                    f'✅ Private Link Connection approved: {conn_name}',
-                    f'❌ Failed to approve Private Link Connection: {conn_name}',
-                    print_command_to_run = False
+            # Approve all pending connections concurrently as each approval is an independent, I/O-bound az call
+            def approve_connection(conn: dict) -> Output:
+                return utils.run(
+                    f'az network private-endpoint-connection approve --id {conn.get("id")} --description "Approved by infrastructure deployment"',
+                    print_command_to_run = False,
+                    print_errors = False
                 )
+            
+            with ThreadPoolExecutor(max_workers = min(MAX_PARALLEL_APPROVALS, total)) as executor:
+                approve_results = list(executor.map(approve_connection, pending_connections))
+            
+            # Report the results in their original order once all approvals have completed
+            all_approved = True
+            
+            for i, (conn, approve_result) in enumerate(zip(pending_connections, approve_results), 1):
+                conn_name = conn.get('name', '<unknown>')
                 
-                if not approve_result.success:
-                    return False
+                if approve_result.success:
+                    print(f'   ✅ Private Link Connection approved ({i}/{total}): {conn_name}')
+                else:
+                    # The approvals run with print_errors disabled to keep concurrent output readable, so report the az error here
+                    print(f'   ❌ Failed to approve Private Link Connection ({i}/{total}): {conn_name}\n{approve_result.text}')
+                    all_approved = False
+            
+            if not all_approved:
+                return False
             
             print('   ✅ All private link connections approved successfully')
             return True
@@ -420,39 +481,26 @@ class AfdApimAcaInfrastructure(Infrastructure):
             # Update parameters to disable public access
             self.bicep_parameters['apimPublicAccess']['value'] = False
             
-            # Write updated parameters file
-            original_cwd = os.getcwd()
-            shared_dir = Path(__file__).parent
-            infra_dir = shared_dir.parent.parent / 'infrastructure' / 'afd-apim-pe'
+            # Write updated parameters file using absolute paths, so the working directory does not need to change
+            infra_dir = INFRASTRUCTURE_ROOT / INFRASTRUCTURE_DIRECTORIES[self.infra]
             
-            try:
-                os.chdir(infra_dir)
-                
-                bicep_parameters_format = {
-                    '$schema': 'https://schema.management.azure.com/schemas/2019-04-01/deploymentParameters.json#',
-                    'contentVersion': '1.0.0.0',
-                    'parameters': self.bicep_parameters
-                }
-                
-                params_file_path = infra_dir / 'params.json'
-                with open(params_file_path, 'w') as file:
-                    file.write(json.dumps(bicep_parameters_format))
-                
-                print('   📝 Updated parameters to disable public access')
-                
-                # Run the second deployment
-                main_bicep_path = infra_dir / 'main.bicep'
-                output = utils.run(
-                    f'az deployment group create --name {self.infra.value}-lockdown --resource-group {self.rg_name} --template-file "{main_bicep_path}" --parameters "{params_file_path}" --query "properties.outputs"',
-                    '✅ Public access disabled successfully',
-                    '❌ Failed to disable public access',
-                    print_command_to_run = False
-                )
-                
-                return output.success
-                
-            finally:
-                os.chdir(original_cwd)
+            # The whole parameters file is rewritten from the current parameters, including the flipped apimPublicAccess value
+            params_file_path = self._get_bicep_parameters_file_path(infra_dir)
+            self._write_bicep_parameters_file(params_file_path)
+            
+            print('   📝 Updated parameters to disable public access')
+            
+            # Run the second deployment
+            main_bicep_path = infra_dir / 'main.bicep'
+            output = utils.run(
+                ['az', 'deployment', 'group', 'create', '--name', f'{self.infra.value}-lockdown', '--resource-group', self.rg_name,
+                 '--template-file', str(main_bicep_path), '--parameters', str(params_file_path), '--query', 'properties.outputs'],
+                '✅ Public access disabled successfully',
+                '❌ Failed to disable public access',
+                print_command_to_run = False
+            )
+            
+            return output.success
                 
         except Exception as e:
             print(f'   ❌ Error during public access disable: {str(e)}')
@@ -496,7 +544,8 @@ class AfdApimAcaInfrastructure(Infrastructure):
         Deploy the AFD-APIM-PE infrastructure with the required multi-step process.
         
         Args:
-            is_update (bool): Whether this is an update to existing infrastructure or a new deployment.
+            is_update (bool): Whether this is an update to existing infrastructure or a new deployment. An update assumes
+                the resource group already exists and skips creating it.
             
         Returns:
             utils.Output: The deployment result.
@@ -573,26 +622,30 @@ class AfdApimAcaInfrastructure(Infrastructure):
             bool: True if verification passed, False otherwise.
         """
         try:
-            # Check Front Door
-            afd_output = utils.run(f'az afd profile list -g {rg_name} --query "[0]" -o json', print_command_to_run = False, print_errors = False)
+            # List the Front Door profile, Container Apps and APIM service with a single az call rather than one CLI start-up per resource type
+            resources_output = utils.run(
+                f'az resource list -g {rg_name} --query "[?type==\'Microsoft.Cdn/profiles\' || type==\'Microsoft.App/containerApps\' || type==\'Microsoft.ApiManagement/service\'].{{name:name, id:id, type:type, sku:sku.name}}" -o json',
+                print_command_to_run = False,
+                print_errors = False
+            )
+            
+            resources = resources_output.json_data if resources_output.success and isinstance(resources_output.json_data, list) else []
+            afd_profiles = [r for r in resources if r.get('type') == 'Microsoft.Cdn/profiles' and 'AzureFrontDoor' in (r.get('sku') or '')]
             
-            if afd_output.success and afd_output.json_data:
-                afd_name = afd_output.json_data.get('name')
+            if afd_profiles:
+                afd_name = afd_profiles[0].get('name')
                 print(f'✅ Azure Front Door verified: {afd_name}')
                 
                 # Check Container Apps if they exist (optional for this infrastructure)
-                aca_output = utils.run(f'az containerapp list -g {rg_name} --query "length(@)"', print_command_to_run = False, print_errors = False)
-                
-                if aca_output.success:
-                    aca_count = int(aca_output.text.strip())
-                    if aca_count > 0:
-                        print(f'✅ Container Apps verified: {aca_count} app(s) created')
+                aca_count = sum(1 for r in resources if r.get('type') == 'Microsoft.App/containerApps')
+                if aca_count > 0:
+                    print(f'✅ Container Apps verified: {aca_count} app(s) created')
                 
                 # Verify private endpoint connections (optional - don't fail if it errors)
                 try:
-                    apim_output = utils.run(f'az apim list -g {rg_name} --query "[0].id" -o tsv', print_command_to_run = False, print_errors = False)
-                    if apim_output.success and apim_output.text.strip():
-                        apim_id = apim_output.text.strip()
+                    apim_ids = [r.get('id') for r in resources if r.get('type') == 'Microsoft.ApiManagement/service' and r.get('id')]
+                    if apim_ids:
+                        apim_id = apim_ids[0]
                         pe_output = utils.run(f'az network private-endpoint-connection list --id {apim_id} --query "length(@)"', print_command_to_run = False, print_errors = False)
                         if pe_output.success:
                             pe_count = int(pe_output.text.strip())
@@ -14,13 +14,15 @@ import traceback
 import string
 import secrets
 import base64
+import shlex
+import shutil
 import inspect
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from typing import Any, Optional, Tuple
-from apimtypes import APIM_SKU, HTTP_VERB, INFRASTRUCTURE
+from apimtypes import APIM_SKU, BICEP_PARAMETERS_SCHEMA, HTTP_VERB, INFRASTRUCTURE, read_policy_xml_file
 
 
 # ------------------------------
@@ -46,6 +48,9 @@ CONSOLE_WIDTH = 175
 # Thread-safe print lock
 _print_lock = threading.Lock()
 
+# Project root directories found by find_project_root, keyed by the working directory the search started from
+_project_root_cache: dict[str, str] = {}
+
 
 # ------------------------------
 #    HELPER FUNCTIONS
@@ -592,22 +597,22 @@ class NotebookHelper:
         query_cmd = f'az group list --tag infrastructure={infrastructure.value} --query "[].name" -o tsv'
         output = run(query_cmd, print_command_to_run = False, print_errors = False)
         
-        if output.success and output.text.strip():
-            rg_names = [name.strip() for name in output.text.strip().split('\n') if name.strip()]
-            
-            for rg_name in rg_names:
-                # Parse the resource group name to extract the index
-                # Expected format: apim-infra-{infrastructure}-{index} or apim-infra-{infrastructure}
-                prefix = f'apim-infra-{infrastructure.value}'
-                
+        if output.success:
+            # Expected format: apim-infra-{infrastructure}-{index} or apim-infra-{infrastructure}
+            prefix = f'apim-infra-{infrastructure.value}'
+            indexed_prefix = prefix + '-'
+
+            # Parse each resource group name in the same pass that splits the output
+            for line in output.text.splitlines():
+                rg_name = line.strip()
+
                 if rg_name == prefix:
                     # No index
                     instances.append((infrastructure, None))
-                elif rg_name.startswith(prefix + '-'):
+                elif rg_name.startswith(indexed_prefix):
                     # Has index
                     try:
-                        index_str = rg_name[len(prefix + '-'):]
-                        index = int(index_str)
+                        index = int(rg_name[len(indexed_prefix):])
                         instances.append((infrastructure, index))
                     except ValueError:
                         # Invalid index format, skip
@@ -751,7 +756,7 @@ def _cleanup_resources(deployment_name: str, rg_name: str) -> None:
 
             # Delete the resource group last
             print_message(f"Deleting resource group '{rg_name}'...")
-            output = run(f'az group delete --name {rg_name} -y', f"Resource group '{rg_name}' deleted', f'Failed to delete resource group '{rg_name}'", print_command_to_run = False)
+            output = run(f'az group delete --name {rg_name} -y', f"Resource group '{rg_name}' deleted", f"Failed to delete resource group '{rg_name}'", print_command_to_run = False)
 
             print_message('Cleanup completed.')
 
@@ -896,7 +901,7 @@ def get_azure_role_guid(role_name: str) -> Optional[str]:
         return None
 
 
-def create_bicep_deployment_group(rg_name: str, rg_location: str, deployment: str | INFRASTRUCTURE, bicep_parameters: dict, bicep_parameters_file: str = 'params.json', rg_tags: dict | None = None, is_debug: bool = False) -> Output:
+def create_bicep_deployment_group(rg_name: str, rg_location: str, deployment: str | INFRASTRUCTURE, bicep_parameters: dict, bicep_parameters_file: str = 'params.json', rg_tags: dict | None = None, is_debug: bool = False, bicep_dir: str | None = None) -> Output:
     """
     Create a Bicep deployment in a resource group, writing parameters to a file and running the deployment.
     Creates the resource group if it does not exist.
@@ -909,6 +914,7 @@ def create_bicep_deployment_group(rg_name: str, rg_location: str, deployment: st
         bicep_parameters_file (str, optional): File to write parameters to.
         rg_tags (dict, optional): Additional tags to apply to the resource group.
         is_debug (bool, optional): Whether to enable debug mode. Defaults to False.
+        bicep_dir (str, optional): Directory containing main.bicep. Determined from the current working directory if not provided.
 
     Returns:
         Output: The result of the deployment command.
@@ -922,12 +928,6 @@ def create_bicep_deployment_group(rg_name: str, rg_location: str, deployment: st
     else:
         deployment_name = deployment
 
-    bicep_parameters_format = {
-        '$schema': 'https://schema.management.azure.com/schemas/2019-04-01/deploymentParameters.json#',
-        'contentVersion': '1.0.0.0',
-        'parameters': bicep_parameters
-    }
-
     # Determine the correct deployment name and find the Bicep directory
     if hasattr(deployment, 'value'):
         deployment_name = deployment.value
@@ -937,11 +937,18 @@ def create_bicep_deployment_group(rg_name: str, rg_location: str, deployment: st
         infrastructure_dir = deployment
     
     # Use helper function to determine the correct Bicep directory
-    bicep_dir = _determine_bicep_directory(infrastructure_dir)
+    if bicep_dir is None:
+        bicep_dir = _determine_bicep_directory(infrastructure_dir)
     
     main_bicep_path = os.path.join(bicep_dir, 'main.bicep')
     params_file_path = os.path.join(bicep_dir, bicep_parameters_file)
 
+    bicep_parameters_format = {
+        '$schema': BICEP_PARAMETERS_SCHEMA,
+        'contentVersion': '1.0.0.0',
+        'parameters': bicep_parameters
+    }
+
     # Write the updated bicep parameters to the specified parameters file
     with open(params_file_path, 'w') as file:
         file.write(json.dumps(bicep_parameters_format))
@@ -952,10 +959,11 @@ def create_bicep_deployment_group(rg_name: str, rg_location: str, deployment: st
     if not os.path.exists(main_bicep_path):
         raise FileNotFoundError(f'main.bicep file not found in expected infrastructure directory: {bicep_dir}')
 
-    cmd = f'az deployment group create --name {deployment_name} --resource-group {rg_name} --template-file "{main_bicep_path}" --parameters "{params_file_path}" --query "properties.outputs"'
+    cmd = ['az', 'deployment', 'group', 'create', '--name', deployment_name, '--resource-group', rg_name,
+           '--template-file', main_bicep_path, '--parameters', params_file_path, '--query', 'properties.outputs']
 
     if is_debug:
-        cmd += ' --debug'
+        cmd.append('--debug')
 
     print('\nDeploying bicep...\n')
     return run(cmd, f"Deployment '{deployment_name}' succeeded", f"Deployment '{deployment_name}' failed.", print_command_to_run = False)
@@ -972,7 +980,14 @@ def find_project_root() -> str:
     Raises:
         FileNotFoundError: If project root cannot be determined.
     """
-    current_dir = os.getcwd()
+    start_dir = os.getcwd()
+
+    # Policy path helpers call this once per file, so avoid walking the directory tree again for the same starting directory
+    cached_root = _project_root_cache.get(start_dir)
+    if cached_root is not None:
+        return cached_root
+
+    current_dir = start_dir
     
     # Look for marker files that indicate the project root
     marker_files = ['requirements.txt', 'README.md', 'bicepconfig.json']
@@ -981,6 +996,7 @@ def find_project_root() -> str:
         if any(os.path.exists(os.path.join(current_dir, marker)) for marker in marker_files):
             # Additional check: verify this looks like our project by checking for samples directory
             if os.path.exists(os.path.join(current_dir, 'samples')):
+                _project_root_cache[start_dir] = current_dir
                 return current_dir
         current_dir = os.path.dirname(current_dir)
     
@@ -990,9 +1006,10 @@ def find_project_root() -> str:
 
 def create_bicep_deployment_group_for_sample(sample_name: str, rg_name: str, rg_location: str, bicep_parameters: dict, bicep_parameters_file: str = 'params.json', rg_tags: dict | None = None, is_debug: bool = False) -> Output:
     """
-    Create a Bicep deployment for a sample, handling the working directory change automatically.
+    Create a Bicep deployment for a sample, resolving the sample directory automatically.
     This function ensures that the params.json file is written to the correct sample directory
-    regardless of the current working directory (e.g., when running from VS Code).
+    regardless of the current working directory (e.g., when running from VS Code). The sample
+    directory is passed through explicitly, so the process-wide working directory is left untouched.
 
     Args:
         sample_name (str): Name of the sample (used for deployment name and directory).
@@ -1006,41 +1023,29 @@ def create_bicep_deployment_group_for_sample(sample_name: str, rg_name: str, rg_
     Returns:
         Output: The result of the deployment command.
     """
-    import os
+
+    current_dir = os.getcwd()
+
+    # Determine the sample directory path
+    # This handles both cases: running from project root or from sample directory
+    if os.path.basename(current_dir) == sample_name:
+        # Already in the sample directory
+        sample_dir = current_dir
+    else:
+        # Assume we're in project root or elsewhere, locate the sample directory
+        project_root = find_project_root()
+        sample_dir = os.path.join(project_root, 'samples', sample_name)
     
-    # Get the current working directory
-    original_cwd = os.getcwd()
+    # Verify the sample directory exists and has main.bicep
+    if not os.path.exists(sample_dir):
+        raise FileNotFoundError(f'Sample directory not found: {sample_dir}')
     
-    try:
-        # Determine the sample directory path
-        # This handles both cases: running from project root or from sample directory
-        if os.path.basename(original_cwd) == sample_name:
-            # Already in the sample directory
-            sample_dir = original_cwd
-        else:
-            # Assume we're in project root or elsewhere, navigate to sample directory
-            project_root = find_project_root()
-            sample_dir = os.path.join(project_root, 'samples', sample_name)
-        
-        # Verify the sample directory exists and has main.bicep
-        if not os.path.exists(sample_dir):
-            raise FileNotFoundError(f'Sample directory not found: {sample_dir}')
-        
-        main_bicep_path = os.path.join(sample_dir, 'main.bicep')
-        if not os.path.exists(main_bicep_path):
-            raise FileNotFoundError(f'main.bicep not found in sample directory: {sample_dir}')
-        
-        # Change to the sample directory to ensure params.json is written there
-        os.chdir(sample_dir)
-        print(f'📁 Changed working directory to: {sample_dir}')
-        
-        # Call the original deployment function
-        return create_bicep_deployment_group(rg_name, rg_location, sample_name, bicep_parameters, bicep_parameters_file, rg_tags, is_debug)
-        
-    finally:
-        # Always restore the original working directory
-        os.chdir(original_cwd)
-        print(f'📁 Restored working directory to: {original_cwd}')
+    main_bicep_path = os.path.join(sample_dir, 'main.bicep')
+    if not os.path.exists(main_bicep_path):
+        raise FileNotFoundError(f'main.bicep not found in sample directory: {sample_dir}')
+    
+    # Call the original deployment function, pointing it at the sample directory so that params.json is written there
+    return create_bicep_deployment_group(rg_name, rg_location, sample_name, bicep_parameters, bicep_parameters_file, rg_tags, is_debug, bicep_dir = sample_dir)
 
 
 def create_resource_group(rg_name: str, resource_group_location: str | None = None, tags: dict | None = None) -> None:
@@ -1220,9 +1225,8 @@ def read_and_modify_policy_xml(policy_xml_filepath: str, replacements: dict[str,
     policy_xml_filepath = determine_policy_path(policy_xml_filepath, sample_name)
     # print(f'📄 Reading policy XML from : {policy_xml_filepath}')  # debug
 
-    # Read the specified policy XML file
-    with open(policy_xml_filepath, 'r', encoding='utf-8') as policy_xml_file:
-        policy_template_xml = policy_xml_file.read()
+    # Read the specified policy XML file (cached while unchanged on disk)
+    policy_template_xml = read_policy_xml_file(policy_xml_filepath)
 
     if replacements is not None and isinstance(replacements, dict):
         # Replace placeholders in the policy XML with provided values
@@ -1320,9 +1324,8 @@ def read_policy_xml(policy_xml_filepath_or_filename: str, named_values: dict[str
     policy_xml_filepath = determine_policy_path(policy_xml_filepath_or_filename, sample_name)
     # print(f'📄 Reading policy XML from : {policy_xml_filepath}')  # debug
 
-    # Read the specified policy XML file
-    with open(policy_xml_filepath, 'r', encoding='utf-8') as policy_xml_file:
-        policy_template_xml = policy_xml_file.read()
+    # Read the specified policy XML file (cached while unchanged on disk)
+    policy_template_xml = read_policy_xml_file(policy_xml_filepath)
 
     # Apply named values formatting if provided
     if named_values is not None and isinstance(named_values, dict):
@@ -1426,7 +1429,7 @@ def _cleanup_resources_with_thread_safe_printing(deployment_name: str, rg_name:
             # Delete the resource group last
             with _print_lock:
                 _print_log(f"{thread_prefix}Deleting resource group '{rg_name}'...", 'ℹ️ ', thread_color, show_time=True)
-            output = run(f'az group delete --name {rg_name} -y', f"Resource group '{rg_name}' deleted', f'Failed to delete resource group '{rg_name}'", print_command_to_run = False)
+            output = run(f'az group delete --name {rg_name} -y', f"Resource group '{rg_name}' deleted", f"Failed to delete resource group '{rg_name}'", print_command_to_run = False)
 
             with _print_lock:
                 _print_log(f"{thread_prefix}Cleanup completed.", 'ℹ️ ', thread_color, show_time=True)
@@ -1730,12 +1733,12 @@ def get_rg_name(deployment_name: str, index: int | None = None) -> str:
     print_val('Resource group name', rg_name)
     return rg_name
 
-def run(command: str, ok_message: str = '', error_message: str = '', print_output: bool = False, print_command_to_run: bool = True, print_errors: bool = True, print_warnings: bool = True) -> Output:
+def run(command: str | list[str], ok_message: str = '', error_message: str = '', print_output: bool = False, print_command_to_run: bool = True, print_errors: bool = True, print_warnings: bool = True) -> Output:
     """
     Execute a shell command, log the command and its output, and attempt to extract JSON from the output.
 
     Args:
-        command (str): The shell command to execute.
+        command (str | list[str]): The shell command to execute, or an argument list to run directly without a shell.
         ok_message (str, optional): Message to print if the command succeeds. Defaults to ''.
         error_message (str, optional): Message to print if the command fails. Defaults to ''.
         print_output (bool, optional): Whether to print the command output on failure. Defaults to False.
@@ -1750,15 +1753,25 @@ def run(command: str, ok_message: str = '', error_message: str = '', print_outpu
             - json_data (any, optional): Parsed JSON object or array if found in the output, else None.
     """
 
+    # An argument list is run directly rather than through a shell, so paths containing spaces need no quoting.
+    # The executable is resolved on PATH first, as on Windows the az CLI is a .cmd script that would not be found otherwise.
+    if isinstance(command, list):
+        command_args = [shutil.which(command[0]) or command[0], *command[1:]]
+        command_text = shlex.join(command)
+        use_shell = False
+    else:
+        command_args = command_text = command
+        use_shell = True
+
     if print_command_to_run:
-        print_command(command)
+        print_command(command_text)
 
     start_time = time.time()
 
     # Execute the command and capture the output
 
     try:
-        output_text = subprocess.check_output(command, shell = True, stderr = subprocess.STDOUT).decode('utf-8')
+        output_text = subprocess.check_output(command_args, shell = use_shell, stderr = subprocess.STDOUT).decode('utf-8')
         success = True
     except Exception as e:
         # Handles both CalledProcessError and any custom/other exceptions (for test mocks)
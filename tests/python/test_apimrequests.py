@@ -36,7 +36,7 @@ def test_init_no_key():
     assert apim.headers['Accept'] == 'application/json'
 
 @pytest.mark.http
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 @patch('apimrequests.utils.print_message')
 @patch('apimrequests.utils.print_info')
 @patch('apimrequests.utils.print_error')
@@ -52,11 +52,11 @@ def test_single_get_success(mock_print_error, mock_print_info, mock_print_messag
     with patch.object(apim, '_print_response') as mock_print_response:
         result = apim.singleGet(default_path, printResponse=True)
         assert result == '{\n    "result": "ok"\n}'
-        mock_print_response.assert_called_once_with(mock_response)
+        mock_print_response.assert_called_once_with(mock_response, pretty_body=result)
         mock_print_error.assert_not_called()
 
 @pytest.mark.http
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 @patch('apimrequests.utils.print_message')
 @patch('apimrequests.utils.print_info')
 @patch('apimrequests.utils.print_error')
@@ -67,7 +67,7 @@ def test_single_get_error(mock_print_error, mock_print_info, mock_print_message,
     mock_print_error.assert_called_once()
 
 @pytest.mark.http
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 @patch('apimrequests.utils.print_message')
 @patch('apimrequests.utils.print_info')
 @patch('apimrequests.utils.print_error')
@@ -83,7 +83,7 @@ def test_single_post_success(mock_print_error, mock_print_info, mock_print_messa
     with patch.object(apim, '_print_response') as mock_print_response:
         result = apim.singlePost(default_path, data=default_data, printResponse=True)
         assert result == '{\n    "created": true\n}'
-        mock_print_response.assert_called_once_with(mock_response)
+        mock_print_response.assert_called_once_with(mock_response, pretty_body=result)
         mock_print_error.assert_not_called()
 
 @pytest.mark.http
@@ -110,6 +110,55 @@ def test_multi_get_success(mock_print_info, mock_print_message, mock_session, ap
         assert mock_sess.request.call_count == 2
         mock_print_code.assert_called()
 
+@pytest.mark.unit
+@patch('apimrequests.requests.Session')
+@patch('apimrequests.utils.print_info')
+@patch('apimrequests.time.perf_counter_ns')
+def test_multi_get_times_requests_with_perf_counter(mock_perf_counter_ns, mock_print_info, mock_session, apim):
+    """Test that response times are measured on the monotonic performance counter."""
+    mock_perf_counter_ns.side_effect = [1_000_000_000, 1_250_000_000]
+    mock_session.return_value.request.return_value.headers = {'Content-Type': 'text/plain'}
+
+    with patch.object(apim, '_print_response_code'):
+        result = apim.multiGet(default_path, runs=1, sleepMs=0)
+
+    assert result[0]['response_time'] == pytest.approx(0.25)
+
+@pytest.mark.unit
+@patch('apimrequests.requests.Session')
+@patch('apimrequests.utils.print_info')
+@patch('apimrequests.time.sleep')
+def test_multi_get_concurrency_sends_all_runs_without_sleeping(mock_sleep, mock_print_info, mock_session, apim):
+    """Test that concurrent runs are all sent, reported in run order and not separated by sleeps."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {'Content-Type': 'text/plain'}
+    mock_response.text = 'ok'
+    mock_session.return_value.request.return_value = mock_response
+
+    with patch.object(apim, '_print_response_code'):
+        result = apim.multiGet(default_path, runs=3, concurrency=3)
+
+    assert [run['run'] for run in result] == [1, 2, 3]
+    assert mock_session.return_value.request.call_count == 3
+    mock_sleep.assert_not_called()
+    mock_session.return_value.close.assert_called_once()
+
+    # The connection pool is sized to the concurrency for both schemes
+    mounted = {c.args[0]: c.args[1] for c in mock_session.return_value.mount.call_args_list}
+    assert set(mounted) == {'http://', 'https://'}
+    assert all(adapter._pool_maxsize == 3 for adapter in mounted.values())
+
+@pytest.mark.unit
+@pytest.mark.parametrize('concurrency', [0, -1])
+@patch('apimrequests.requests.Session')
+def test_multi_get_rejects_concurrency_below_one(mock_session, apim, concurrency):
+    """Test that a concurrency below 1 is rejected before any request is sent."""
+    with pytest.raises(ValueError, match='concurrency must be at least 1'):
+        apim.multiGet(default_path, runs=1, concurrency=concurrency)
+
+    mock_session.assert_not_called()
+
 @pytest.mark.http
 @patch('apimrequests.requests.Session')
 @patch('apimrequests.utils.print_message')
@@ -135,7 +184,7 @@ def make_apim():
 @pytest.mark.http
 def test_single_post_error():
     apim = make_apim()
-    with patch('apimrequests.requests.request') as mock_request, \
+    with patch('apimrequests.requests.Session.request') as mock_request, \
          patch('apimrequests.utils.print_error') as mock_print_error:
         import requests
         mock_request.side_effect = requests.RequestException('fail')
@@ -162,7 +211,7 @@ def test_multi_get_non_json():
 @pytest.mark.http
 def test_request_header_merging():
     apim = make_apim()
-    with patch('apimrequests.requests.request') as mock_request:
+    with patch('apimrequests.requests.Session.request') as mock_request:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.headers = {'Content-Type': 'application/json'}
@@ -214,7 +263,7 @@ def test_headers_property_is_dict_reference():
 # ------------------------------
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 def test_request_with_custom_headers(mock_request, apim):
     """Test request with custom headers merged with default headers."""
     mock_response = MagicMock()
@@ -232,7 +281,7 @@ def test_request_with_custom_headers(mock_request, apim):
     assert SUBSCRIPTION_KEY_PARAMETER_NAME in call_kwargs['headers']
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 def test_request_timeout_error(mock_request, apim):
     """Test request with timeout error."""
     mock_request.side_effect = requests.exceptions.Timeout()
@@ -242,7 +291,7 @@ def test_request_timeout_error(mock_request, apim):
     assert result is None
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 def test_request_connection_error(mock_request, apim):
     """Test request with connection error."""
     mock_request.side_effect = requests.exceptions.ConnectionError()
@@ -252,7 +301,7 @@ def test_request_connection_error(mock_request, apim):
     assert result is None
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 def test_request_http_error(mock_request, apim):
     """Test request with HTTP error response."""
     mock_response = MagicMock()
@@ -268,7 +317,7 @@ def test_request_http_error(mock_request, apim):
     assert result == 'Resource not found'
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 def test_request_non_json_response(mock_request, apim):
     """Test request with non-JSON response."""
     mock_response = MagicMock()
@@ -284,7 +333,7 @@ def test_request_non_json_response(mock_request, apim):
     assert result == 'Plain text response'
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 def test_request_with_data(mock_request, apim):
     """Test POST request with data."""
     mock_response = MagicMock()
@@ -323,7 +372,7 @@ def test_headers_setter(apim):
 
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 @patch('apimrequests.utils.print_message')
 @patch('apimrequests.utils.print_info')
 def test_request_with_message(mock_print_info, mock_print_message, mock_request, apim):
@@ -342,7 +391,7 @@ def test_request_with_message(mock_print_info, mock_print_message, mock_request,
 
 
 @pytest.mark.unit
-@patch('apimrequests.requests.request')
+@patch('apimrequests.requests.Session.request')
 @patch('apimrequests.utils.print_info')
 def test_request_path_without_leading_slash(mock_print_info, mock_request, apim):
     """Test _request method with path without leading slash."""
@@ -363,6 +412,24 @@ def test_request_path_without_leading_slash(mock_print_info, mock_request, apim)
     assert args[1] == expected_url
 
 
+@pytest.mark.unit
+@patch('apimrequests.requests.Session')
+@patch('apimrequests.utils.print_info')
+def test_single_requests_reuse_one_session(mock_print_info, mock_session_class, apim):
+    """Test that single requests share one session until the object is closed."""
+    mock_session = mock_session_class.return_value
+    mock_session.request.return_value.headers = {'Content-Type': 'text/plain'}
+
+    with apim:
+        apim.singleGet('/first', printResponse=False)
+        apim.singlePost('/second', data=default_data, printResponse=False)
+
+    mock_session_class.assert_called_once()
+    assert mock_session.request.call_count == 2
+    mock_session.close.assert_called_once()
+    assert apim._session is None
+
+
 @pytest.mark.unit
 @patch('apimrequests.requests.Session')
 @patch('apimrequests.utils.print_message')
@@ -449,6 +516,23 @@ def test_print_response_non_200_status(mock_print_val, apim):
     mock_print_val.assert_any_call('Response body', '{"error": "not found"}', True)
 
 
+@pytest.mark.unit
+@patch('apimrequests.utils.print_val')
+@patch('apimrequests.json.loads')
+def test_print_response_uses_pretty_body(mock_json_loads, mock_print_val, apim):
+    """Test that _print_response prints an already formatted body without parsing the response again."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {'Content-Type': 'application/json'}
+    pretty_body = '{\n    "result": "ok"\n}'
+
+    with patch.object(apim, '_print_response_code'):
+        apim._print_response(mock_response, pretty_body=pretty_body)
+
+    mock_json_loads.assert_not_called()
+    mock_print_val.assert_any_call('Response body', pretty_body, True)
+
+
 @pytest.mark.unit
 @patch('apimrequests.requests.get')
 @patch('apimrequests.utils.print_info')
@@ -1052,3 +1052,25 @@ def test_constants_accessibility():
     # Test other constants
     assert isinstance(apimtypes.SUBSCRIPTION_KEY_PARAMETER_NAME, str)
     assert isinstance(apimtypes.SLEEP_TIME_BETWEEN_REQUESTS_MS, int)
+
+
+# ------------------------------
+#    POLICY XML CACHE TESTS
+# ------------------------------
+
+@pytest.mark.unit
+def test_default_policy_xml_read_once_for_multiple_operations(monkeypatch):
+    """Test that operations without a policy reuse the cached default policy XML instead of re-reading it from disk."""
+    import builtins
+    from unittest.mock import MagicMock
+
+    monkeypatch.setattr(apimtypes, '_policy_xml_cache', {})
+    real_open = builtins.open
+    mock_open = MagicMock(side_effect = real_open)
+    monkeypatch.setattr(builtins, 'open', mock_open)
+
+    op1 = apimtypes.GET_APIOperation('Get 1')
+    op2 = apimtypes.GET_APIOperation('Get 2')
+
+    assert op1.policyXml == op2.policyXml
+    assert mock_open.call_count == 1
@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock, call
 import sys
 import os
 import json
+import matplotlib as mpl
 
 # Add the shared/python directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'shared', 'python'))
@@ -373,6 +374,54 @@ def test_color_mapping_logic(mock_dataframe, mock_plt):
     assert 'color' in call_kwargs
 
 
+@patch('charts.plt')
+def test_bar_colors_follow_backend_index_and_status_code(mock_plt):
+    """Test that bars are colored per backend index for 200 responses and lightcoral otherwise."""
+    mixed_results = [
+        {'run': 1, 'response_time': 0.1, 'status_code': 200, 'response': '{"index": 1}'},
+        {'run': 2, 'response_time': 0.2, 'status_code': 200, 'response': '{"index": 2}'},
+        {'run': 3, 'response_time': 0.3, 'status_code': 500, 'response': 'Error'},
+        {'run': 4, 'response_time': 0.4, 'status_code': 200, 'response': '{"index": 1}'},
+    ]
+
+    with patch('pandas.DataFrame.plot') as mock_plot:
+        chart = BarChart('Test', 'X', 'Y', mixed_results)
+        chart._plot_barchart(mixed_results)
+
+    assert mock_plot.call_args[1]['color'] == ['lightyellow', 'lightblue', 'lightcoral', 'lightyellow']
+
+
+@patch('charts.plt')
+def test_plot_barchart_sizes_and_closes_its_own_figure(mock_plt, sample_api_results):
+    """Test that the figure size is set per plot and the figure is closed after it is shown."""
+    figsize = mpl.rcParams['figure.figsize']
+
+    with patch('pandas.DataFrame.plot') as mock_plot:
+        BarChart('Test', 'X', 'Y', sample_api_results)._plot_barchart(sample_api_results)
+
+    assert mock_plot.call_args[1]['figsize'] == (15, 7)
+    assert mpl.rcParams['figure.figsize'] == figsize
+    mock_plt.show.assert_called_once()
+    mock_plt.close.assert_called_once_with(mock_plot.return_value.figure)
+
+
+@patch('charts.plt')
+def test_mean_line_excludes_high_outliers(mock_plt):
+    """Test that the mean line averages 200 response times at or below the 95th percentile."""
+    results = [
+        {'run': 1, 'response_time': 0.1, 'status_code': 200, 'response': '{"index": 1}'},
+        {'run': 2, 'response_time': 0.2, 'status_code': 200, 'response': '{"index": 1}'},
+        {'run': 3, 'response_time': 0.9, 'status_code': 500, 'response': 'Error'},
+        {'run': 4, 'response_time': 0.4, 'status_code': 200, 'response': '{"index": 1}'},
+    ]
+
+    with patch('pandas.DataFrame.plot'):
+        BarChart('Test', 'X', 'Y', results)._plot_barchart(results)
+
+    # The 400 ms response is above the 95th percentile and the 900 ms response is not a 200
+    assert mock_plt.axhline.call_args[1]['y'] == pytest.approx(150.0)
+
+
 # ------------------------------
 #    INTEGRATION TESTS
 # ------------------------------
@@ -9,7 +9,7 @@ import os
 from pathlib import Path
 
 import infrastructures
-from apimtypes import INFRASTRUCTURE, APIM_SKU, APIMNetworkMode, API, PolicyFragment, HTTP_VERB, GET_APIOperation
+from apimtypes import INFRASTRUCTURE, APIM_SKU, APIMNetworkMode, API, PolicyFragment, HTTP_VERB, GET_APIOperation, BICEP_PARAMETERS_SCHEMA
 
 
 # ------------------------------
@@ -341,7 +341,7 @@ def test_base_infrastructure_verification_success(mock_utils):
     # Mock successful APIM service check
     mock_apim_output = Mock()
     mock_apim_output.success = True
-    mock_apim_output.json_data = {'name': 'test-apim'}
+    mock_apim_output.text = 'test-apim'
     
     # Mock successful API count check
     mock_api_output = Mock()
@@ -353,13 +353,40 @@ def test_base_infrastructure_verification_success(mock_utils):
     mock_sub_output.success = True
     mock_sub_output.text = 'test-subscription-key'
     
-    mock_utils.run.side_effect = [mock_apim_output, mock_api_output, mock_sub_output]
+    # The API and subscription lookups run concurrently, so dispatch on the command rather than on call order
+    def mock_run(command, *args, **kwargs):
+        if 'az apim api list' in command:
+            return mock_api_output
+        if 'az apim subscription list' in command:
+            return mock_sub_output
+        return mock_apim_output
+
+    mock_utils.run.side_effect = mock_run
     
     result = infra._verify_infrastructure('test-rg')
     
     assert result is True
     mock_utils.does_resource_group_exist.assert_called_once_with('test-rg')
-    assert mock_utils.run.call_count >= 2  # At least APIM list and API count
+    assert mock_utils.run.call_count == 3  # APIM list, API count and subscription key
+
+@pytest.mark.unit
+def test_base_infrastructure_verification_with_deployment_apim_name(mock_utils):
+    """Test that verification skips the resource group and APIM lookups when the deployment reported the APIM service name."""
+    infra = infrastructures.Infrastructure(
+        infra=INFRASTRUCTURE.SIMPLE_APIM,
+        index=TEST_INDEX,
+        rg_location=TEST_LOCATION
+    )
+
+    mock_utils.run.side_effect = lambda command, *args, **kwargs: Mock(success = True, text = '1')
+
+    result = infra._verify_infrastructure('test-rg', 'test-apim')
+
+    assert result is True
+    mock_utils.does_resource_group_exist.assert_not_called()
+    commands = [call.args[0] for call in mock_utils.run.call_args_list]
+    assert not any('az apim list' in command for command in commands)
+    assert any('--service-name test-apim' in command for command in commands)
 
 @pytest.mark.unit
 def test_base_infrastructure_verification_missing_rg(mock_utils):
@@ -444,6 +471,35 @@ def test_apim_aca_infrastructure_verification_success(mock_utils):
         print_errors=False
     )
 
+@pytest.mark.unit
+def test_apim_aca_infrastructure_full_verification_runs_all_checks(mock_utils):
+    """Test that full APIM-ACA verification runs the API, subscription and Container Apps checks."""
+    infra = infrastructures.ApimAcaInfrastructure(
+        rg_location=TEST_LOCATION,
+        index=TEST_INDEX,
+        apim_sku=APIM_SKU.BASICV2
+    )
+
+    mock_utils.does_resource_group_exist.return_value = True
+
+    def mock_run(command, *args, **kwargs):
+        if 'az apim list' in command:
+            return Mock(success = True, text = 'test-apim')
+        if 'az apim api list' in command:
+            return Mock(success = True, text = '2')
+        if 'az apim subscription list' in command:
+            return Mock(success = True, text = 'test-subscription-key')
+        return Mock(success = True, text = '3')
+
+    mock_utils.run.side_effect = mock_run
+
+    result = infra._verify_infrastructure('test-rg')
+
+    assert result is True
+    commands = [call.args[0] for call in mock_utils.run.call_args_list]
+    assert len(commands) == 4
+    assert 'az containerapp list -g test-rg --query "length(@)"' in commands
+
 @pytest.mark.unit
 def test_apim_aca_infrastructure_verification_failure(mock_utils):
     """Test APIM-ACA infrastructure-specific verification failure."""
@@ -477,28 +533,29 @@ def test_afd_apim_infrastructure_verification_success(mock_utils):
         apim_sku=APIM_SKU.STANDARDV2
     )
     
-    # Mock successful Front Door check
-    mock_afd_output = Mock()
-    mock_afd_output.success = True
-    mock_afd_output.json_data = {'name': 'test-afd'}
-    
-    # Mock successful Container Apps check
-    mock_aca_output = Mock()
-    mock_aca_output.success = True
-    mock_aca_output.text = '2'  # 2 Container Apps
+    # Mock the single resource listing with a Front Door profile, two Container Apps and the APIM service
+    mock_resources_output = Mock()
+    mock_resources_output.success = True
+    mock_resources_output.json_data = [
+        {'name': 'test-afd', 'id': 'afd-resource-id', 'type': 'Microsoft.Cdn/profiles', 'sku': 'Standard_AzureFrontDoor'},
+        {'name': 'aca-1', 'id': 'aca-1-resource-id', 'type': 'Microsoft.App/containerApps', 'sku': None},
+        {'name': 'aca-2', 'id': 'aca-2-resource-id', 'type': 'Microsoft.App/containerApps', 'sku': None},
+        {'name': 'test-apim', 'id': 'apim-resource-id', 'type': 'Microsoft.ApiManagement/service', 'sku': 'StandardV2'}
+    ]
     
-    # Mock successful APIM check for private endpoints (optional third call)
-    mock_apim_output = Mock()
-    mock_apim_output.success = True
-    mock_apim_output.text = 'apim-resource-id'
+    # Mock private endpoint connection count
+    mock_pe_output = Mock()
+    mock_pe_output.success = True
+    mock_pe_output.text = '1'
     
-    mock_utils.run.side_effect = [mock_afd_output, mock_aca_output, mock_apim_output]
+    mock_utils.run.side_effect = [mock_resources_output, mock_pe_output]
     
     result = infra._verify_infrastructure_specific('test-rg')
     
     assert result is True
-    # Allow for 2-3 calls (3rd call is optional for private endpoint verification)
-    assert mock_utils.run.call_count >= 2
+    assert mock_utils.run.call_count == 2
+    assert 'az resource list -g test-rg' in mock_utils.run.call_args_list[0].args[0]
+    assert '--id apim-resource-id ' in mock_utils.run.call_args_list[1].args[0]
 
 @pytest.mark.unit
 def test_afd_apim_infrastructure_verification_no_afd(mock_utils):
@@ -520,6 +577,45 @@ def test_afd_apim_infrastructure_verification_no_afd(mock_utils):
     
     assert result is False
 
+@pytest.mark.unit
+def test_afd_apim_infrastructure_approve_private_link_connections(mock_utils):
+    """Test that every pending private link connection is approved."""
+    infra = infrastructures.AfdApimAcaInfrastructure(TEST_LOCATION, TEST_INDEX)
+
+    pending = [{'id': f'conn-id-{i}', 'name': f'conn-{i}'} for i in range(3)]
+    mock_utils.run.side_effect = lambda command, *args, **kwargs: (
+        Mock(success = True, is_json = True, json_data = pending) if 'list' in command else Mock(success = True)
+    )
+
+    result = infra._approve_private_link_connections('apim-service-id')
+
+    assert result is True
+    approve_commands = [c.args[0] for c in mock_utils.run.call_args_list if 'approve' in c.args[0]]
+    assert len(approve_commands) == 3
+    for conn in pending:
+        assert any(f'--id {conn["id"]} ' in cmd for cmd in approve_commands)
+
+@pytest.mark.unit
+def test_afd_apim_infrastructure_approve_private_link_connections_failure(mock_utils):
+    """Test that a single failed approval fails the approval step."""
+    infra = infrastructures.AfdApimAcaInfrastructure(TEST_LOCATION, TEST_INDEX)
+
+    pending = [{'id': 'conn-id-ok', 'name': 'conn-ok'}, {'id': 'conn-id-bad', 'name': 'conn-bad'}]
+    mock_utils.run.side_effect = lambda command, *args, **kwargs: (
+        Mock(success = True, is_json = True, json_data = pending) if 'list' in command
+        else Mock(success = 'conn-id-bad' not in command, text = 'ERROR: approval denied')
+    )
+
+    with patch('builtins.print') as mock_print:
+        result = infra._approve_private_link_connections('apim-service-id')
+
+    assert result is False
+
+    # The az error text is reported with the failed connection, since the approvals do not print their own errors
+    failure_messages = [c.args[0] for c in mock_print.call_args_list if 'Failed to approve' in c.args[0]]
+    assert len(failure_messages) == 1
+    assert 'conn-bad' in failure_messages[0] and 'ERROR: approval denied' in failure_messages[0]
+
 @pytest.mark.unit
 def test_afd_apim_infrastructure_bicep_parameters(mock_utils):
     """Test AFD-APIM-PE specific Bicep parameters."""
@@ -592,13 +688,12 @@ def test_all_concrete_infrastructure_classes_have_verification(mock_utils):
 # ------------------------------
 
 @pytest.mark.unit
-@patch('os.getcwd')
+@patch('os.replace')
 @patch('os.chdir') 
 @patch('pathlib.Path')
-def test_deploy_infrastructure_success(mock_path_class, mock_chdir, mock_getcwd, mock_utils):
+def test_deploy_infrastructure_success(mock_path_class, mock_chdir, mock_replace, mock_utils):
     """Test successful infrastructure deployment."""
     # Setup mocks
-    mock_getcwd.return_value = '/original/path'
     mock_infra_dir = Mock()
     mock_path_instance = Mock()
     mock_path_instance.parent = mock_infra_dir
@@ -609,11 +704,11 @@ def test_deploy_infrastructure_success(mock_path_class, mock_chdir, mock_getcwd,
         def verify_infrastructure(self) -> bool:
             return True
     
-    # Mock file writing and JSON dumps to avoid MagicMock serialization issues
+    # Mock file reading (default policies) and writing (params.json)
     mock_open = MagicMock()
+    mock_open.return_value.__enter__.return_value.read.return_value = '<policies />'
     
-    with patch('builtins.open', mock_open), \
-         patch('json.dumps', return_value='{"mocked": "params"}') as mock_json_dumps:
+    with patch('builtins.open', mock_open):
         
         infra = TestInfrastructure(
             infra=INFRASTRUCTURE.SIMPLE_APIM,
@@ -630,25 +725,33 @@ def test_deploy_infrastructure_success(mock_path_class, mock_chdir, mock_getcwd,
     # Note: utils.verify_infrastructure is currently commented out in the actual code
     # mock_utils.verify_infrastructure.assert_called_once()
     
-    # Verify directory changes - just check that chdir was called twice (to infra dir and back)
-    assert mock_chdir.call_count == 2
-    # Second call should restore original path
-    mock_chdir.assert_any_call('/original/path')
+    # Verify the deployment uses absolute paths rather than changing the working directory
+    mock_chdir.assert_not_called()
     
     # Verify file writing (open will be called multiple times - for reading policies and writing params)
     assert mock_open.call_count >= 1  # At least called once for writing params.json
-    mock_json_dumps.assert_called_once()
+    
+    # Verify the index-specific parameters file is written to a temporary file, swapped into place and passed to az
+    params_file_path = infrastructures.INFRASTRUCTURE_ROOT / 'simple-apim' / f'params-{TEST_INDEX}.json'
+    mock_replace.assert_called_once()
+    assert mock_replace.call_args.args[1] == params_file_path
+    assert str(params_file_path) in mock_utils.run.call_args_list[0].args[0]
+    
+    # Verify the params.json content is a valid ARM deployment parameters document
+    written_params = json.loads(mock_open.return_value.__enter__.return_value.write.call_args.args[0])
+    assert written_params['$schema'] == infrastructures.BICEP_PARAMETERS_SCHEMA
+    assert written_params['contentVersion'] == '1.0.0.0'
+    assert written_params['parameters'] == infra.bicep_parameters
     
     assert result.success is True
 
 @pytest.mark.unit
-@patch('os.getcwd')
+@patch('os.replace')
 @patch('os.chdir')
 @patch('pathlib.Path')
-def test_deploy_infrastructure_failure(mock_path_class, mock_chdir, mock_getcwd, mock_utils):
+def test_deploy_infrastructure_failure(mock_path_class, mock_chdir, mock_replace, mock_utils):
     """Test infrastructure deployment failure."""
     # Setup mocks for failure scenario
-    mock_getcwd.return_value = '/original/path'
     mock_infra_dir = Mock()
     mock_path_instance = Mock()
     mock_path_instance.parent = mock_infra_dir
@@ -682,13 +785,94 @@ def test_deploy_infrastructure_failure(mock_path_class, mock_chdir, mock_getcwd,
     # Note: utils.verify_infrastructure is currently commented out in the actual code
     # mock_utils.verify_infrastructure.assert_not_called()  # Should not be called on failure
     
-    # Verify directory changes (should restore even on failure) 
-    assert mock_chdir.call_count == 2
-    # Second call should restore original path
-    mock_chdir.assert_any_call('/original/path')
+    # Verify the working directory is never changed, even on failure
+    mock_chdir.assert_not_called()
     
     assert result.success is False
 
+@pytest.mark.unit
+def test_deploy_infrastructure_update_skips_resource_group_creation(mock_utils):
+    """Test that updating existing infrastructure does not look up or create the resource group again."""
+    infra = infrastructures.SimpleApimInfrastructure(TEST_LOCATION, TEST_INDEX)
+
+    mock_open = MagicMock()
+    mock_open.return_value.__enter__.return_value.read.return_value = '<policies />'
+
+    with patch('builtins.open', mock_open), patch('os.replace'):
+        result = infra.deploy_infrastructure(is_update = True)
+
+    assert result.success is True
+    mock_utils.create_resource_group.assert_not_called()
+
+@pytest.mark.unit
+@pytest.mark.parametrize('outputs, expected_apim_name', [
+    ({'apimServiceName': {'value': 'test-apim'}}, 'test-apim'),
+    ({}, None),
+])
+def test_deploy_infrastructure_passes_apim_name_only_when_output(mock_utils, outputs, expected_apim_name):
+    """Test that verification gets the APIM name from the outputs when present, without an error when it is missing."""
+    import utils
+
+    outputs = {**outputs, 'apimResourceGatewayURL': {'value': 'https://test-apim.azure-api.net'}, 'apiOutputs': {'value': []}}
+    mock_utils.run.return_value = utils.Output(True, json.dumps(outputs))
+
+    infra = infrastructures.SimpleApimInfrastructure(TEST_LOCATION, TEST_INDEX)
+
+    mock_open = MagicMock()
+    mock_open.return_value.__enter__.return_value.read.return_value = '<policies />'
+
+    with patch('builtins.open', mock_open), patch('os.replace'), \
+         patch('utils.print_error') as mock_print_error, \
+         patch.object(infra, '_verify_infrastructure') as mock_verify:
+        infra.deploy_infrastructure()
+
+    mock_verify.assert_called_once_with(infra.rg_name, expected_apim_name)
+    mock_print_error.assert_not_called()
+
+@pytest.mark.unit
+def test_write_bicep_parameters_file_writes_current_parameters(mock_utils, tmp_path):
+    """Test that every params.json write reflects the current parameters, including lists changed in place."""
+    infra = infrastructures.AfdApimAcaInfrastructure(TEST_LOCATION, TEST_INDEX)
+    infra._define_policy_fragments()
+    infra._define_apis()
+    infra._define_bicep_parameters()
+    
+    params_file_path = tmp_path / 'params.json'
+    infra._write_bicep_parameters_file(params_file_path)
+    
+    infra.bicep_parameters['apimPublicAccess']['value'] = False
+    infra.bicep_parameters['apis']['value'].pop()
+    infra._write_bicep_parameters_file(params_file_path)
+    
+    written_params = json.loads(params_file_path.read_text())
+    assert written_params['$schema'] == BICEP_PARAMETERS_SCHEMA
+    assert written_params['contentVersion'] == '1.0.0.0'
+    assert written_params['parameters'] == infra.bicep_parameters
+    assert written_params['parameters']['apimPublicAccess']['value'] is False
+    
+    # The temporary file used for the atomic write is renamed into place rather than left behind
+    assert [p.name for p in tmp_path.iterdir()] == ['params.json']
+
+@pytest.mark.unit
+def test_write_bicep_parameters_file_leaves_no_temporary_file_on_error(mock_utils, tmp_path):
+    """Test that a failed parameters file write neither leaves a temporary file behind nor replaces the existing file."""
+    infra = infrastructures.SimpleApimInfrastructure(TEST_LOCATION, TEST_INDEX)
+    params_file_path = tmp_path / 'params.json'
+    params_file_path.write_text('{}')
+
+    # An unserializable value fails while encoding
+    infra.bicep_parameters = {'bad': {'value': object()}}
+    with pytest.raises(TypeError):
+        infra._write_bicep_parameters_file(params_file_path)
+
+    # A failure after the temporary file was created removes it again
+    infra.bicep_parameters = {}
+    with patch('os.replace', side_effect = OSError('busy')), pytest.raises(OSError):
+        infra._write_bicep_parameters_file(params_file_path)
+
+    assert [p.name for p in tmp_path.iterdir()] == ['params.json']
+    assert params_file_path.read_text() == '{}'
+
 
 # ------------------------------
 #    CONCRETE INFRASTRUCTURE CLASSES TESTS
@@ -0,0 +1,43 @@
+"""
+Unit tests for the JSONC helpers used by the setup scripts.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the setup directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'setup'))
+
+from jsonc import strip_jsonc, loads_jsonc
+
+
+# ------------------------------
+#    STRIP_JSONC
+# ------------------------------
+
+@pytest.mark.unit
+def test_strip_jsonc_keeps_comment_markers_inside_strings():
+    content = '{\n  // comment\n  "url": "https://example.com/*x*/"\n}'
+    assert strip_jsonc(content) == '{\n  \n  "url": "https://example.com/*x*/"\n}'
+
+
+@pytest.mark.unit
+def test_strip_jsonc_leaves_trailing_commas():
+    content = '{"a": 1,}'
+    assert strip_jsonc(content) == content
+
+
+# ------------------------------
+#    LOADS_JSONC
+# ------------------------------
+
+@pytest.mark.unit
+def test_loads_jsonc_accepts_trailing_commas():
+    content = '{\n  "python.analysis.extraPaths": [\n    "${workspaceFolder}/shared/python",\n  ],\n  "a": 1, // last\n}\n'
+    assert loads_jsonc(content) == {'python.analysis.extraPaths': ['${workspaceFolder}/shared/python'], 'a': 1}
+
+
+@pytest.mark.unit
+def test_loads_jsonc_keeps_commas_inside_strings():
+    assert loads_jsonc('{"a": "x,}", "b": ",]",}') == {'a': 'x,}', 'b': ',]'}
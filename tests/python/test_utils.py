@@ -117,6 +117,18 @@ def test_run_failure(monkeypatch):
     assert out.success is False
     assert isinstance(out.text, str)
 
+def test_run_argument_list_without_shell(monkeypatch):
+    """Test that an argument list is run directly rather than through a shell."""
+    mock_check_output = MagicMock(return_value = b'{"a": 1}')
+    monkeypatch.setattr('subprocess.check_output', mock_check_output)
+    monkeypatch.setattr('shutil.which', lambda name: f'/usr/bin/{name}')
+
+    out = utils.run(['az', 'deployment', 'group', 'create', '--template-file', '/path with spaces/main.bicep'], print_command_to_run = False)
+
+    assert out.success is True
+    assert mock_check_output.call_args.args[0] == ['/usr/bin/az', 'deployment', 'group', 'create', '--template-file', '/path with spaces/main.bicep']
+    assert mock_check_output.call_args.kwargs['shell'] is False
+
 # ------------------------------
 #    create_resource_group & does_resource_group_exist
 # ------------------------------
@@ -215,6 +227,49 @@ def test_read_policy_xml_auto_detection_failure(monkeypatch):
     with pytest.raises(ValueError, match='Could not auto-detect sample name'):
         utils.read_policy_xml('policy.xml', {'key': 'value'})
 
+def test_read_policy_xml_caches_unchanged_file(tmp_path, monkeypatch):
+    """Test that an unchanged policy file is only read from disk once."""
+    policy_file = tmp_path / 'policy.xml'
+    policy_file.write_text('<policies />', encoding = 'utf-8')
+
+    real_open = builtins.open
+    m = MagicMock(side_effect = real_open)
+    monkeypatch.setattr(builtins, 'open', m)
+
+    assert utils.read_policy_xml(str(policy_file)) == '<policies />'
+    assert utils.read_policy_xml(str(policy_file)) == '<policies />'
+    assert m.call_count == 1
+
+def test_read_policy_xml_rereads_modified_file(tmp_path):
+    """Test that a modified policy file is read again rather than served from the cache."""
+    policy_file = tmp_path / 'policy.xml'
+    policy_file.write_text('<policies />', encoding = 'utf-8')
+    assert utils.read_policy_xml(str(policy_file)) == '<policies />'
+
+    policy_file.write_text('<policies><inbound /></policies>', encoding = 'utf-8')
+    assert utils.read_policy_xml(str(policy_file)) == '<policies><inbound /></policies>'
+
+# ------------------------------
+#    find_project_root
+# ------------------------------
+
+def test_find_project_root_caches_result_per_working_directory(tmp_path, monkeypatch):
+    """Test that the project root is only searched for once per starting directory."""
+    (tmp_path / 'README.md').write_text('', encoding = 'utf-8')
+    (tmp_path / 'samples').mkdir()
+    nested_dir = tmp_path / 'samples' / 'nested'
+    nested_dir.mkdir()
+    monkeypatch.chdir(nested_dir)
+    monkeypatch.setattr(utils, '_project_root_cache', {})
+
+    assert utils.find_project_root() == str(tmp_path)
+
+    mock_exists = MagicMock(side_effect = AssertionError('directory tree walked again'))
+    monkeypatch.setattr(utils.os.path, 'exists', mock_exists)
+
+    assert utils.find_project_root() == str(tmp_path)
+    mock_exists.assert_not_called()
+
 # ------------------------------
 #    cleanup_resources (smoke)
 # ------------------------------
@@ -361,6 +416,30 @@ def test_cleanup_resources_no_resources(monkeypatch):
         assert not any(pattern in cmd for cmd in run_commands), f"Unexpected delete/purge command found: {pattern}"
 
 
+def test_cleanup_resources_resource_group_delete_messages(monkeypatch):
+    """Test _cleanup_resources passes separate ok and error messages for the resource group deletion."""
+    run_calls = {}
+
+    def mock_run(command, ok_message='', error_message='', print_command_to_run=True, print_errors=True, print_warnings=True):
+        run_calls[command] = (ok_message, error_message)
+
+        if 'deployment group show' in command:
+            return utils.Output(success=True, text='{"properties": {"provisioningState": "Succeeded"}}')
+
+        if any(x in command for x in ['cognitiveservices account list', 'apim list', 'keyvault list']):
+            return utils.Output(success=True, text='[]')
+
+        return utils.Output(success=True, text='Operation completed')
+
+    monkeypatch.setattr(utils, 'run', mock_run)
+    monkeypatch.setattr(utils, 'print_info', lambda *a, **kw: None)
+    monkeypatch.setattr(utils, 'print_message', lambda *a, **kw: None)
+
+    utils._cleanup_resources('test-deployment', 'test-rg')
+
+    assert run_calls['az group delete --name test-rg -y'] == ("Resource group 'test-rg' deleted", "Failed to delete resource group 'test-rg'")
+
+
 def test_cleanup_resources_command_failures(monkeypatch):
     """Test _cleanup_resources when commands fail."""
     
@@ -935,9 +1014,9 @@ def test_create_bicep_deployment_group_with_enum(monkeypatch):
     # Verify deployment command was called with enum value
     mock_run.assert_called_once()
     actual_cmd = mock_run.call_args[0][0]
-    assert 'az deployment group create' in actual_cmd
-    assert '--name simple-apim' in actual_cmd
-    assert '--resource-group test-rg' in actual_cmd
+    assert actual_cmd[:4] == ['az', 'deployment', 'group', 'create']
+    assert actual_cmd[actual_cmd.index('--name') + 1] == 'simple-apim'
+    assert actual_cmd[actual_cmd.index('--resource-group') + 1] == 'test-rg'
 
 def test_create_bicep_deployment_group_with_string(monkeypatch):
     """Test create_bicep_deployment_group with string deployment name."""
@@ -965,7 +1044,7 @@ def test_create_bicep_deployment_group_with_string(monkeypatch):
     # Verify deployment command uses string deployment name
     mock_run.assert_called_once()
     actual_cmd = mock_run.call_args[0][0]
-    assert '--name custom-deployment' in actual_cmd
+    assert actual_cmd[actual_cmd.index('--name') + 1] == 'custom-deployment'
 
 def test_create_bicep_deployment_group_params_file_written(monkeypatch):
     """Test that bicep parameters are correctly written to file."""
@@ -1248,23 +1327,30 @@ def test_create_bicep_deployment_group_for_sample_success(monkeypatch):
     import os
     mock_output = utils.Output(success=True, text='{"outputs": {"test": "value"}}')
     
-    def mock_create_bicep(rg_name, rg_location, deployment, bicep_parameters, bicep_parameters_file='params.json', rg_tags=None, is_debug=False):
+    bicep_dirs = []
+    
+    def mock_create_bicep(rg_name, rg_location, deployment, bicep_parameters, bicep_parameters_file='params.json', rg_tags=None, is_debug=False, bicep_dir=None):
+        bicep_dirs.append(bicep_dir)
         return mock_output
     
     # Mock file system checks
     def mock_exists(path):
         return True  # Pretend all paths exist
     
-    def mock_chdir(path):
-        pass  # Do nothing
+    mock_chdir = MagicMock()
     
     monkeypatch.setattr(utils, 'create_bicep_deployment_group', mock_create_bicep)
     monkeypatch.setattr(utils, 'build_infrastructure_tags', lambda x: [])
+    monkeypatch.setattr(utils, 'find_project_root', lambda: '/project')
     monkeypatch.setattr(os.path, 'exists', mock_exists)
     monkeypatch.setattr(os, 'chdir', mock_chdir)
     
     result = utils.create_bicep_deployment_group_for_sample('test-sample', 'test-rg', 'eastus', {})
     assert result.success is True
+    
+    # The sample directory is passed explicitly instead of changing the working directory
+    assert bicep_dirs == [os.path.join('/project', 'samples', 'test-sample')]
+    mock_chdir.assert_not_called()
 
 
 def test_extract_json_invalid_input():